@@ -76,14 +76,15 @@ try:
 
     import probing
 
-    # Query for Ray task spans
-    task_spans = probing.query("SELECT * FROM TraceEvent WHERE name LIKE 'ray.task.%'")
-    print(f"Found {len(task_spans)} task spans")
-
-    # Query for Ray actor method spans
-    actor_spans = probing.query(
-        "SELECT * FROM TraceEvent WHERE name LIKE 'ray.actor.%'"
+    # Query Ray task and actor spans in one roundtrip, then split client-side
+    spans = probing.query(
+        "SELECT * FROM TraceEvent "
+        "WHERE name LIKE 'ray.task.%' OR name LIKE 'ray.actor.%'"
     )
+    is_task = spans["name"].str.startswith("ray.task.")
+    task_spans = spans[is_task]
+    actor_spans = spans[~is_task]
+    print(f"Found {len(task_spans)} task spans")
     print(f"Found {len(actor_spans)} actor method spans")
 
     # Get timeline (similar to Ray dashboard)
@@ -91,31 +92,38 @@ try:
     timeline = get_ray_timeline()
     print(f"Found {len(timeline)} timeline entries")
 
-    # Show timeline entries
+    # Show timeline entries (batched into a single write)
     if timeline:
-        print("\nTimeline entries:")
+        lines = ["\nTimeline entries:"]
         for entry in timeline[:5]:
             duration_ms = entry["duration"] / 1_000_000 if entry["duration"] else None
-            print(f"  - {entry['name']} ({entry['type']})")
-            print(
-                f"    Start: {entry['start_time']}, Duration: {duration_ms}ms"
-                if duration_ms
-                else f"    Start: {entry['start_time']}"
-            )
-
-    # Export to Chrome tracing format
+            lines.append(f"  - {entry['name']} ({entry['type']})")
+            if duration_ms:
+                lines.append(f"    Start: {entry['start_time']}, Duration: {duration_ms}ms")
+            else:
+                lines.append(f"    Start: {entry['start_time']}")
+        print("\n".join(lines))
+
+    # Export to Chrome tracing format (streamed to a file, bounded memory)
     print("\nExporting timeline to Chrome format...")
-    chrome_trace = get_ray_timeline_chrome_format()
-    print(f"Chrome trace format (first 200 chars): {chrome_trace[:200]}...")
-    print("Save this to a .json file and open in chrome://tracing")
+    import tempfile
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as trace_file:
+        get_ray_timeline_chrome_format(writer=trace_file)
+        trace_path = trace_file.name
+    with open(trace_path) as f:
+        preview = f.read(200)
+    print(f"Chrome trace format (first 200 chars): {preview}...")
+    print(f"Full trace written to {trace_path}; open it in chrome://tracing")
 
 except Exception as e:
     print(f"Error querying trace data: {e}")
 
-for i in range(1000):
-    import time
+# Keep the process alive so the traces can be inspected; a single Event.wait
+# sleeps without periodic wakeups and still responds promptly to Ctrl-C.
+import threading
 
-    time.sleep(1)
+threading.Event().wait(1000)
 
 # Cleanup
 ray.shutdown()
@@ -115,6 +115,12 @@ def table(name_or_class: Optional[Union[str, Type[Any]]] = None):
             table = cache[cls]
             table.append_many([dataclasses.astuple(i) for i in self])
 
+        @classmethod
+        def append_many_rows(cls, rows):
+            """Append pre-built field tuples without materializing instances."""
+            table = cache[cls]
+            table.append_many(rows)
+
         @classmethod
         def take(cls, n):
             table = cache[cls]
@@ -132,6 +138,7 @@ def table(name_or_class: Optional[Union[str, Type[Any]]] = None):
         setattr(cls, "init_table", init_table)
         setattr(cls, "append", append)
         setattr(cls, "append_many", append_many)
+        setattr(cls, "append_many_rows", append_many_rows)
         setattr(cls, "take", take)
         setattr(cls, "drop", drop)
         setattr(cls, "save", save)
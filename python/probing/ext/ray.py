@@ -508,18 +508,28 @@ def get_ray_timeline_chrome_format(
     actor_filter: Optional[str] = None,
     start_time: Optional[int] = None,
     end_time: Optional[int] = None,
+    writer=None,
 ) -> str:
     """Get Ray timeline in Chrome tracing format.
 
     Returns JSON string that can be viewed in chrome://tracing or perfetto.
     Each process represents a different worker, with process name showing worker and node info.
+
+    When ``writer`` (a file-like object) is given, the JSON document is
+    streamed into it chunk by chunk via ``json.JSONEncoder.iterencode``
+    instead of being materialized as one string; an empty string is returned
+    in that case. This keeps memory bounded for very large timelines.
     """
     try:
         import json
 
         timeline = get_ray_timeline(task_filter, actor_filter, start_time, end_time)
         if not timeline:
-            return json.dumps({"traceEvents": []})
+            empty = json.dumps({"traceEvents": []})
+            if writer is not None:
+                writer.write(empty)
+                return ""
+            return empty
 
         earliest_time = min(
             entry["start_time"] for entry in timeline if entry["start_time"]
@@ -637,10 +647,17 @@ def get_ray_timeline_chrome_format(
                     }
                 )
 
-        return json.dumps(
-            {"traceEvents": trace_events, "displayTimeUnit": "ms"}, indent=2
-        )
+        document = {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+        if writer is not None:
+            for chunk in json.JSONEncoder(indent=2).iterencode(document):
+                writer.write(chunk)
+            return ""
+        return json.dumps(document, indent=2)
     except Exception:
         import json
 
-        return json.dumps({"traceEvents": []})
+        empty = json.dumps({"traceEvents": []})
+        if writer is not None:
+            writer.write(empty)
+            return ""
+        return empty
@@ -1,14 +1,38 @@
+import functools
 import logging
+import weakref
 
 import probing
 
-hooks = {}
+# Keyed by optimizer; weak keys so registering a tracer does not extend the
+# optimizer's lifetime (short-lived optimizers stay collectable).
+hooks = weakref.WeakKeyDictionary()
+
+# Models that already had profiling hooks installed (by id)
+_seen_models = set()
+
+# Truthy spellings, compared case-insensitively (O(1) hash lookup)
+_TRUE_SET = frozenset({"true", "1", "yes", "on"})
 
 
 def is_true(value):
-    if value in ["TRUE", "True", "true", "1", "YES", "Yes", "yes", "ON", "On", "on"]:
-        return True
-    return False
+    return isinstance(value, str) and value.lower() in _TRUE_SET
+
+
+@functools.lru_cache(maxsize=1)
+def _get_parsed_config():
+    """Read and parse the profiling spec once per process.
+
+    The spec is immutable for the process lifetime, so repeated optimizer
+    registrations reuse the same parsed config instead of re-reading and
+    re-parsing it.
+    """
+    from probing.profiling.torch_probe import TorchProbeConfig
+
+    # Get config directly from probing.config
+    # Rust sync_env_settings() converts PROBING_TORCH_PROFILING to probing.torch.profiling
+    spec = probing.config.get_str("probing.torch.profiling")
+    return spec, TorchProbeConfig.parse(spec)
 
 
 def optimizer_step_post_hook(optimizer, *args, **kwargs):
@@ -16,13 +40,9 @@ def optimizer_step_post_hook(optimizer, *args, **kwargs):
     if optimizer not in hooks:
         from probing.profiling.torch import install_hooks
         from probing.profiling.torch.module_utils import get_toplevel_module
-        from probing.profiling.torch_probe import TorchProbe, TorchProbeConfig
-
-        # Get config directly from probing.config
-        # Rust sync_env_settings() converts PROBING_TORCH_PROFILING to probing.torch.profiling
-        spec = probing.config.get_str("probing.torch.profiling")
+        from probing.profiling.torch_probe import TorchProbe
 
-        config = TorchProbeConfig.parse(spec)
+        spec, config = _get_parsed_config()
         if not config.enabled:
             logging.getLogger(__name__).info(
                 "Torch profiling disabled (torch.profiling=%s)",
@@ -41,9 +61,16 @@ def optimizer_step_post_hook(optimizer, *args, **kwargs):
             config.exprs or "",
         )
 
-        models = get_toplevel_module()
-        for model in models:
-            install_hooks(model, tracer=tracer)
+        # get_toplevel_module walks the whole gc heap; once the first
+        # optimizer has instrumented the live models, later optimizers only
+        # need hooks on themselves.
+        if not _seen_models:
+            models = get_toplevel_module()
+            for model in models:
+                if id(model) in _seen_models:
+                    continue
+                _seen_models.add(id(model))
+                install_hooks(model, tracer=tracer)
         install_hooks(opt=optimizer, tracer=tracer)
         hooks[optimizer] = tracer
 
@@ -855,22 +855,37 @@ def list_traceable(prefix=None, depth=2):
         >>> list_traceable("torch.nn")  # doctest: +SKIP
         >>> list_traceable("torch.*.Linear")  # doctest: +SKIP
     """
+    return json.dumps(list_traceable_native(prefix, depth), indent=2)
+
+
+def list_traceable_native(prefix=None, depth=2):
+    """Like :func:`list_traceable` but returns the list directly.
+
+    In-process callers (e.g. the %trace magic) should prefer this variant:
+    it skips the json.dumps/json.loads round trip over what can be a list
+    of thousands of items.
+
+    Args:
+        prefix: Optional prefix to filter results. Supports wildcards.
+        depth: Maximum depth for recursive traversal (default: 2)
+
+    Returns:
+        List of dicts with "name", "type" and "variables" keys.
+    """
     collector = _TraceableCollector()
     filter_func = collector.create_filter(prefix)
     traceable_items = collector.collect_traceable_items(depth, filter_func)
     traceable_items = collector.filter_by_prefix(traceable_items, prefix)
 
     # Always return structured data with variables
-    result = []
-    for item in traceable_items:
-        result.append(
-            {
-                "name": item["name"],
-                "type": item["type"],
-                "variables": item.get("variables", []),
-            }
-        )
-    return json.dumps(result, indent=2)
+    return [
+        {
+            "name": item["name"],
+            "type": item["type"],
+            "variables": item.get("variables", []),
+        }
+        for item in traceable_items
+    ]
 
 
 def getname(obj):
@@ -1069,4 +1084,9 @@ def untrace(func_or_name):
 
 
 def show_trace():
-    return json.dumps([x for x in traced_functions.keys()], indent=2)
+    return json.dumps(show_trace_native(), indent=2)
+
+
+def show_trace_native():
+    """Return the names of currently traced functions as a list."""
+    return list(traced_functions)
@@ -1,5 +1,8 @@
+import functools
 import random
+import sys
 import time
+import weakref
 from dataclasses import dataclass
 from typing import Optional
 
@@ -9,8 +12,32 @@ from probing.core import table
 from .torch.module_utils import module_name
 from .types import BaseTracer
 
-TRUE_VALUES = {"1", "true", "yes", "on", "enable", "enabled"}
-FALSE_VALUES = {"0", "false", "no", "off", "disable", "disabled"}
+# Trace records are created on every sampled stage; slotted dataclasses
+# drop the per-instance __dict__ and make field stores slot writes.
+# dataclass(slots=True) needs 3.10+, so fall back to plain dataclass.
+if sys.version_info >= (3, 10):
+    _record_dataclass = dataclass(slots=True)
+    _config_dataclass = dataclass(frozen=True, slots=True)
+else:
+    _record_dataclass = dataclass
+    _config_dataclass = dataclass(frozen=True)
+
+TRUE_VALUES = frozenset({"1", "true", "yes", "on", "enable", "enabled"})
+FALSE_VALUES = frozenset({"0", "false", "no", "off", "disable", "disabled"})
+
+# First characters of the toggle spellings above; checking one char first
+# rejects most non-matches without hashing the whole string. 'o' appears in
+# both ("on" vs "off"); the authoritative set check disambiguates.
+_TRUTHY_FIRST = frozenset("1tyoe")
+_FALSY_FIRST = frozenset("0fnod")
+
+
+def _is_truthy(lowered):
+    return bool(lowered) and lowered[0] in _TRUTHY_FIRST and lowered in TRUE_VALUES
+
+
+def _is_falsy(lowered):
+    return bool(lowered) and lowered[0] in _FALSY_FIRST and lowered in FALSE_VALUES
 
 
 # Detect and set the appropriate backend (CUDA or MPS)
@@ -29,8 +56,30 @@ def _get_backend():
 backend = _get_backend()
 
 
+def _get_mem_probes():
+    """Resolve the backend memory-stat functions once at import time."""
+    if backend is None:
+        return None
+    import torch
+
+    # Only CUDA exposes memory statistics; MPS and other backends don't yet.
+    if backend is torch.cuda:
+        return (
+            backend.memory_allocated,
+            backend.memory_reserved,
+            backend.max_memory_allocated,
+            backend.max_memory_reserved,
+        )
+    return None
+
+
+_MEM_PROBES = _get_mem_probes()
+# Multiply by the reciprocal instead of dividing by 1024*1024 per field
+_INV_MB = 1.0 / (1024 * 1024)
+
+
 @table
-@dataclass
+@_record_dataclass
 class TorchTrace:
     step: Optional[int] = None
     seq: Optional[int] = None
@@ -42,11 +91,10 @@ class TorchTrace:
     max_cached: float = 0.0
     time_offset: float = 0.0
     duration: float = 0.0
-    duration: float = 0.0
 
 
 @table
-@dataclass
+@_record_dataclass
 class Variables:
     step: Optional[int] = None
     func: Optional[str] = None
@@ -54,9 +102,12 @@ class Variables:
     value: Optional[str] = None
 
 
-@dataclass
+@_config_dataclass
 class TorchProbeConfig:
-    """Configuration container for TorchProbe runtime behaviour.
+    """Immutable configuration container for TorchProbe runtime behaviour.
+
+    Instances are frozen, so a parsed config is hashable and safe to use
+    as a cache key (lru_cache upstream relies on this).
 
     The environment variable ``PROBING_TORCH_PROFILING`` is parsed with the
     following grammar::
@@ -96,71 +147,102 @@ class TorchProbeConfig:
 
         if raw is None:
             return cls(enabled=False)
+        return cls(*_parse_spec(raw))
 
-        spec = raw.strip()
-        if not spec:
-            return cls(enabled=False)
 
-        tokens = [item.strip() for item in spec.split(",") if item.strip()]
-        if not tokens:
-            return cls(enabled=False)
+def _h_enabled(opts, value):
+    lowered = value.lower()
+    if _is_truthy(lowered):
+        opts["enabled"] = True
+    elif _is_falsy(lowered):
+        opts["enabled"] = False
+
+
+def _h_mode(opts, value):
+    opts["mode"] = value
+
+
+def _h_rate(opts, value):
+    try:
+        parsed = float(value)
+    except ValueError:
+        return
+    if parsed > 0:
+        opts["rate"] = parsed
 
-        cfg = cls(enabled=True)
 
-        first = tokens[0]
-        if "=" not in first:
-            lowered = first.lower()
-            if lowered in FALSE_VALUES:
-                return cls(enabled=False)
-            if lowered in TRUE_VALUES:
-                tokens = tokens[1:]
+def _h_tracepy(opts, value):
+    opts["tracepy"] = _is_truthy(value.lower())
+
+
+def _h_sync(opts, value):
+    opts["sync"] = _is_truthy(value.lower())
+
+
+def _h_exprs(opts, value):
+    opts["exprs"] = value
+
+
+# key=value options dispatch through one dict lookup instead of an
+# if/elif chain; "vars" and "watch" are aliases for "exprs"
+_OPTION_HANDLERS = {
+    "enabled": _h_enabled,
+    "mode": _h_mode,
+    "rate": _h_rate,
+    "tracepy": _h_tracepy,
+    "sync": _h_sync,
+    "exprs": _h_exprs,
+    "vars": _h_exprs,
+    "watch": _h_exprs,
+}
+
+# Field order matches the TorchProbeConfig constructor
+_FIELD_ORDER = ("enabled", "mode", "rate", "tracepy", "sync", "exprs")
+
+_DISABLED_FIELDS = (False, "ordered", 1.0, False, False, "")
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_spec(raw):
+    """Parse a spec string into a field tuple, cached per distinct spec."""
+    spec = raw.strip()
+    if not spec:
+        return _DISABLED_FIELDS
+
+    tokens = [item.strip() for item in spec.split(",") if item.strip()]
+    if not tokens:
+        return _DISABLED_FIELDS
+
+    # Handlers mutate a plain dict; the frozen config is built by the caller
+    opts = dict(zip(_FIELD_ORDER, _DISABLED_FIELDS))
+    opts["enabled"] = True
+
+    first = tokens[0]
+    if "=" not in first:
+        lowered = first.lower()
+        if _is_falsy(lowered):
+            return _DISABLED_FIELDS
+        if _is_truthy(lowered):
+            tokens = tokens[1:]
+        else:
+            if ":" in first:
+                mode_token, rate_token = first.split(":", 1)
+                if mode_token:
+                    opts["mode"] = mode_token
+                _h_rate(opts, rate_token)
             else:
-                if ":" in first:
-                    mode_token, rate_token = first.split(":", 1)
-                    if mode_token:
-                        cfg.mode = mode_token
-                    try:
-                        parsed = float(rate_token)
-                    except ValueError:
-                        pass
-                    else:
-                        if parsed > 0:
-                            cfg.rate = parsed
-                else:
-                    cfg.mode = first
-                tokens = tokens[1:]
-
-        for token in tokens:
-            if "=" not in token:
-                continue
-            key, value = token.split("=", 1)
-            key = key.strip().lower()
-            value = value.strip()
-
-            if key == "enabled":
-                lowered = value.lower()
-                if lowered in TRUE_VALUES:
-                    cfg.enabled = True
-                elif lowered in FALSE_VALUES:
-                    cfg.enabled = False
-            elif key == "mode":
-                cfg.mode = value
-            elif key == "rate":
-                try:
-                    parsed = float(value)
-                except ValueError:
-                    continue
-                if parsed <= 0:
-                    continue
-                cfg.rate = parsed
-            elif key == "tracepy":
-                cfg.tracepy = value.lower() in TRUE_VALUES
-            elif key == "sync":
-                cfg.sync = value.lower() in TRUE_VALUES
-            elif key in {"exprs", "vars", "watch"}:
-                cfg.exprs = value
-
-        return cfg
+                opts["mode"] = first
+            tokens = tokens[1:]
+
+    for token in tokens:
+        if "=" not in token:
+            continue
+        key, value = token.split("=", 1)
+        handler = _OPTION_HANDLERS.get(key.strip().lower())
+        if handler is not None:
+            handler(opts, value.strip())
+
+    return tuple(opts[field] for field in _FIELD_ORDER)
 
 
 # Configuration key in probing.config
@@ -213,60 +295,58 @@ def configure(spec: Optional[str] = None) -> TorchProbeConfig:
 
 
 class DelayedRecord:
-    def __init__(self, record, events):
+    __slots__ = ("record", "events", "pool", "save")
+
+    def __init__(self, record, events, pool=None):
         self.record = record
         self.events = events
+        self.pool = pool
+        # Pre-stage records have no events: bind save straight to the
+        # record's own save so that path skips the wrapper entirely
+        if events is None:
+            self.save = record.save
+        else:
+            self.save = self._save_with_events
 
-    def save(self):
-        try:
-            if self.events is not None:
-                start, end = self.events
-                self.record.duration = start.elapsed_time(end) / 1000.0
-            self.record.save()
-        except Exception as e:
-            print(f"Error saving trace: {e}")
+    def _save_with_events(self):
+        start, end = self.events
+        self.record.duration = start.elapsed_time(end) / 1000.0
+        if self.pool is not None:
+            # Recycle the event handles once their timing is read
+            self.pool.append(start)
+            self.pool.append(end)
+        self.record.save()
 
 
-def mem_stats() -> TorchTrace:
-    import torch
+def mem_stats(**fields) -> TorchTrace:
+    """Build a TorchTrace with current memory stats plus any extra fields.
 
-    MB = 1024 * 1024
-
-    if backend is None:
-        # No GPU backend available
+    Extra keyword arguments are forwarded to the TorchTrace constructor so
+    callers on the hot path can fill the whole record in a single call.
+    """
+    if _MEM_PROBES is None:
         return TorchTrace(
             allocated=0.0,
             cached=0.0,
             max_allocated=0.0,
             max_cached=0.0,
+            **fields,
         )
 
-    # Only CUDA supports memory statistics
-    if backend == torch.cuda:
-        return TorchTrace(
-            allocated=backend.memory_allocated() / MB,
-            cached=backend.memory_reserved() / MB,
-            max_allocated=backend.max_memory_allocated() / MB,
-            max_cached=backend.max_memory_reserved() / MB,
-        )
-    else:
-        # MPS and other backends don't have memory statistics yet
-        return TorchTrace(
-            allocated=0.0,
-            cached=0.0,
-            max_allocated=0.0,
-            max_cached=0.0,
-        )
+    allocated, cached, max_allocated, max_cached = [
+        probe() * _INV_MB for probe in _MEM_PROBES
+    ]
+    return TorchTrace(
+        allocated=allocated,
+        cached=cached,
+        max_allocated=max_allocated,
+        max_cached=max_cached,
+        **fields,
+    )
 
 
-STAGEMAP = {
-    "pre forward": "forward",
-    "post forward": "forward",
-    "pre backward": "backward",
-    "post backward": "backward",
-    "pre step": "step",
-    "post step": "step",
-}
+# Slot offset per timing phase within the flat event list below
+_STAGE_ORD = {"forward": 0, "backward": 1, "step": 2}
 
 
 class Timer:
@@ -274,41 +354,57 @@ class Timer:
 
         self.has_backend = backend is not None
         self.sync = sync
-        self.events = {}  # GPU timers
-        self.step_start = None
+        # GPU timers: a flat list with one slot per (module, phase) pair,
+        # sized by finalize_discovery once the module set is frozen. Slot
+        # addressing avoids a tuple allocation + hash per begin/end call.
+        self.events = []
+        self._mod_idx = {}
+        # Recycled CUDA event handles; cudaEventCreate hits the driver, so
+        # events go back on this free list after elapsed_time is read
+        self._event_pool = []
+        self.step_start_ns = None
 
         super().__init__(**kwargs)
 
-    def begin_timing(self, mod, stage) -> float:
+    def _get_event(self):
+        if self._event_pool:
+            return self._event_pool.pop()
+        return backend.Event(enable_timing=True)
+
+    def begin_timing(self, mod, phase) -> float:
         # Synchronize if needed for more accurate timing
         if self.sync and self.has_backend:
             backend.synchronize()
 
         if self.offset() == 0:
-            self.step_start = time.time()
+            self.step_start_ns = time.perf_counter_ns()
             time_offset = 0.0
         else:
-            time_offset = time.time() - self.step_start
+            time_offset = (time.perf_counter_ns() - self.step_start_ns) * 1e-9
 
         if self.has_backend:
-            key = (id(mod), STAGEMAP[stage])
-            event = backend.Event(enable_timing=True)
-            event.record()
-            self.events[key] = event
+            idx = self._mod_idx.get(id(mod))
+            if idx is not None:
+                event = self._get_event()
+                event.record()
+                self.events[idx * 3 + _STAGE_ORD[phase]] = event
         return time_offset
 
-    def end_timing(self, mod, stage) -> tuple:
+    def end_timing(self, mod, phase) -> tuple:
         # Synchronize if needed for more accurate timing
         if self.sync and self.has_backend:
             backend.synchronize()
 
-        time_offset = time.time() - self.step_start
-        key = (id(mod), STAGEMAP[stage])
-
-        if key in self.events:
-            end_event = backend.Event(enable_timing=True)
-            end_event.record()
-            return time_offset, (self.events.pop(key), end_event)
+        time_offset = (time.perf_counter_ns() - self.step_start_ns) * 1e-9
+        idx = self._mod_idx.get(id(mod))
+        if idx is not None:
+            slot = idx * 3 + _STAGE_ORD[phase]
+            start_event = self.events[slot]
+            if start_event is not None:
+                self.events[slot] = None
+                end_event = self._get_event()
+                end_event.record()
+                return time_offset, (start_event, end_event)
         return time_offset, None
 
 
@@ -328,15 +424,23 @@ class Sampler:
         self.finalized = False
         self.sampled_step = True
 
+        # Per-step sampling decisions for random mode, one entry per module
+        self._step_bitmap = None
+
         super().__init__(**kwargs)
 
     def register_mod(self, mod) -> None:
         if self.finalized:
             return
 
+        mid = id(mod)
+        if mid in self.mod_names:
+            return
+
         import torch
 
-        self.mod_names[id(mod)] = module_name(mod) or (
+        # module_name walks named_modules; only pay for it on first sight
+        self.mod_names[mid] = module_name(mod) or (
             mod.__class__.__name__ if isinstance(mod, torch.optim.Optimizer) else "None"
         )
 
@@ -345,9 +449,15 @@ class Sampler:
         mods = sorted(self.mod_names.items(), key=lambda x: len(x[1]))
         self.mod_queue = [x for x, _ in mods]
 
+        # Size the timer's flat event list now that the module set is known
+        self._mod_idx = {mid: i for i, mid in enumerate(self.mod_queue)}
+        self.events = [None] * (len(self.mod_queue) * 3)
+
         if self.mod_queue:
             self.curr_idx = 0
             self.curr_mod = self.mod_queue[0]
+            if self.mode != "ordered":
+                self._refresh_bitmap()
 
     def should_sample(self, mod) -> bool:
         if not self.finalized:
@@ -362,14 +472,40 @@ class Sampler:
 
         if self.mode == "ordered":
             return id(mod) == self.curr_mod
+
+        bitmap = self._step_bitmap
+        if bitmap is not None:
+            idx = self._mod_idx.get(id(mod))
+            if idx is not None:
+                return bool(bitmap[idx])
         return random.random() < self.rate
 
+    def _refresh_bitmap(self) -> None:
+        """Draw all of this step's random-mode sampling decisions at once.
+
+        One vectorized draw (or a single comprehension without numpy)
+        replaces a random.random() call per module stage, and keeps the
+        decision consistent across stages of the same module within a step.
+        """
+        n = len(self.mod_queue)
+        np = sys.modules.get("numpy")
+        if np is not None:
+            self._step_bitmap = np.random.random(n) < self.rate
+        else:
+            rnd = random.random
+            rate = self.rate
+            self._step_bitmap = [rnd() < rate for _ in range(n)]
+
     def next_mod(self) -> None:
-        if self.mod_queue and self.mode == "ordered":
+        if not self.mod_queue:
+            return
+        if self.mode == "ordered":
             self.sampled_step = random.random() < self.rate
             idx = (self.curr_idx + 1) % len(self.mod_queue)
             self.curr_idx = idx
             self.curr_mod = self.mod_queue[idx]
+        else:
+            self._refresh_bitmap()
 
     def set_sampling_mode(self, expr):
         """Set the sampling mode and rate based on the provided expression.
@@ -446,7 +582,7 @@ class VariableTracer:
         >>> # Simple initialization with one variable in one function
         >>> tracer = VariableTracer("x@calculate")
         >>> tracer.variabls
-        {'calculate': ['x']}
+        {'calculate': ('x',)}
 
         >>> # Multiple variables in different functions
         >>> tracer = VariableTracer("x@calculate,y@process,z@calculate")
@@ -455,7 +591,7 @@ class VariableTracer:
         >>> sorted(tracer.variabls['calculate'])
         ['x', 'z']
         >>> tracer.variabls['process']
-        ['y']
+        ('y',)
 
         >>> # Empty string initialization
         >>> tracer = VariableTracer("")
@@ -465,18 +601,20 @@ class VariableTracer:
         >>> # Handling whitespace
         >>> tracer = VariableTracer(" a@func1 , b@func2 ")
         >>> tracer.variabls
-        {'func1': ['a'], 'func2': ['b']}
+        {'func1': ('a',), 'func2': ('b',)}
     """
 
     def __init__(self, exprs="", **kwargs):
-        self.variabls = {}
+        watched = {}
         for expr in exprs.split(","):  # Fixed: using exprs instead of expr
             expr = expr.strip()
             if "@" in expr:
-                var, fun = expr.split("@")
-                if fun not in self.variabls:
-                    self.variabls[fun] = []
-                self.variabls[fun].append(var)
+                var, fun = expr.split("@", 1)
+                watched.setdefault(fun, []).append(var)
+        # Fixed after init: tuples iterate faster than lists, and the
+        # frozenset gives the stack walk an O(1) frame fast-reject
+        self.variabls = {fun: tuple(names) for fun, names in watched.items()}
+        self._watched_funcs = frozenset(self.variabls)
 
     def trace_variables(self):
         """
@@ -492,22 +630,37 @@ class VariableTracer:
         if not self.variabls:
             return
 
-        import inspect
-
-        stacks = inspect.stack()[1:]
-        for stack in stacks:
-            frame = stack.frame
-            code = frame.f_code
-            func = code.co_name
-            if func in self.variabls:
-                for var in self.variabls[func]:
-                    if var in frame.f_locals:
-                        val = frame.f_locals[var]
+        import sys
+
+        # Walk raw frames instead of inspect.stack(): FrameInfo construction
+        # resolves source context per frame, which is far too costly to pay
+        # once per training step.
+        variabls = self.variabls
+        watched_funcs = self._watched_funcs
+        frame = sys._getframe(1)
+        while frame is not None:
+            func = frame.f_code.co_name
+            if func in watched_funcs:
+                frame_locals = frame.f_locals
+                for var in variabls[func]:
+                    if var in frame_locals:
+                        val = frame_locals[var]
                         try:
                             val = str(val)
                         except Exception:
                             val = f"{type(val)}"
                         Variables(self.curr_step, func, var, val).save()
+            frame = frame.f_back
+
+
+def _noop_log(mod, stage, phase, force=False):
+    """Bound over log_pre/log_post while profiling is disabled."""
+    return None
+
+
+# Live probes register themselves here so set_sampling_mode can reach them
+# without walking the whole gc heap; weak refs keep lifetimes unchanged.
+_LIVE_PROBES = weakref.WeakSet()
 
 
 class TorchProbe(BaseTracer, Timer, Sampler, PythonTracer, VariableTracer):
@@ -528,26 +681,59 @@ class TorchProbe(BaseTracer, Timer, Sampler, PythonTracer, VariableTracer):
             exprs=config.exprs,
         )
 
-    def log_module_stage(self, stage, mod, force=False) -> None:
+        if not self.enabled:
+            self.disable()
+
+        _LIVE_PROBES.add(self)
+
+    def enable(self) -> None:
+        """Enable profiling, restoring the real logging methods."""
+        self.enabled = True
+        cls = type(self)
+        self.log_pre = cls.log_pre.__get__(self)
+        self.log_post = cls.log_post.__get__(self)
+
+    def disable(self) -> None:
+        """Disable profiling by binding no-op logging methods.
+
+        Hooks stay installed, but each module call dispatches straight to a
+        no-op instead of re-checking self.enabled in the hot path.
+        """
+        self.enabled = False
+        self.log_pre = _noop_log
+        self.log_post = _noop_log
+
+    def log_pre(self, mod, stage, phase, force=False) -> None:
         if not self.enabled:
             return
         # Skip if we shouldn't log this module
         if not force and not self.should_sample(mod):
             return
 
-        record = mem_stats()
-        record.step = self.curr_step
-        record.seq = self.offset()
-        record.module = self.mod_names.get(id(mod), "None")
-        record.stage = stage
+        record = mem_stats(
+            step=self.curr_step,
+            seq=self.offset(),
+            module=self.mod_names.get(id(mod), "None"),
+            stage=stage,
+            time_offset=self.begin_timing(mod, phase),
+        )
+        self.pending.append(DelayedRecord(record, None))
 
-        if stage.startswith("pre"):
-            record.time_offset = self.begin_timing(mod, stage)
-            # record.save()
-            self.pending.append(DelayedRecord(record, None))
-        else:
-            record.time_offset, events = self.end_timing(mod, stage)
-            self.pending.append(DelayedRecord(record, events))
+    def log_post(self, mod, stage, phase, force=False) -> None:
+        if not self.enabled:
+            return
+        if not force and not self.should_sample(mod):
+            return
+
+        time_offset, events = self.end_timing(mod, phase)
+        record = mem_stats(
+            step=self.curr_step,
+            seq=self.offset(),
+            module=self.mod_names.get(id(mod), "None"),
+            stage=stage,
+            time_offset=time_offset,
+        )
+        self.pending.append(DelayedRecord(record, events, pool=self._event_pool))
 
     def post_step_hook(self, opt, args, kwargs):
         super().post_step_hook(opt, args, kwargs)
@@ -559,26 +745,32 @@ class TorchProbe(BaseTracer, Timer, Sampler, PythonTracer, VariableTracer):
             self.curr_step += 1
             self.next_mod()
 
-        # Ensure backend operations are complete before processing traces
-        if self.has_backend and self.pending:
-            backend.synchronize()
-
-        # process pending records
-        self.pending = [x for x in self.pending if x.save()]
+        # Flush pending records in bulk: one synchronize covers every
+        # elapsed_time readback, and clear() replaces the list rebuild
+        # (save() returns None, so the old filter always emptied the list).
+        pending = self.pending
+        if pending:
+            if self.has_backend:
+                backend.synchronize()
+            # One guard around the whole flush; per-record error handling
+            # moved out of DelayedRecord.save
+            try:
+                for delayed in pending:
+                    delayed.save()
+            except Exception as e:
+                print(f"Error saving trace: {e}")
+            pending.clear()
 
         # trace Python variables
         self.trace_variables()
 
         # reset the step start time
-        self.step_start = 0
+        self.step_start_ns = 0
 
 
 def set_sampling_mode(mode):
-    import gc
-
-    objs = [obj for obj in gc.get_objects() if isinstance(obj, TorchProbe)]
     try:
-        for obj in objs:
+        for obj in list(_LIVE_PROBES):
             obj.set_sampling_mode(mode)
     except Exception as e:
         print(f"Error setting mode: {e}")
@@ -1,8 +1,24 @@
+import sys
 from dataclasses import dataclass
 from typing import Any
 
 from .torch.step import next_step
 
+# Timing phase for each hook pair; passed to the tracer so the hot path
+# does not re-derive it from the stage string on every module call.
+FORWARD = sys.intern("forward")
+BACKWARD = sys.intern("backward")
+STEP = sys.intern("step")
+
+# Stage labels form a closed set; interned singletons let the hot-path
+# comparisons and dict lookups run off cached hashes and identity.
+PRE_FORWARD = sys.intern("pre forward")
+POST_FORWARD = sys.intern("post forward")
+PRE_BACKWARD = sys.intern("pre backward")
+POST_BACKWARD = sys.intern("post backward")
+PRE_STEP = sys.intern("pre step")
+POST_STEP = sys.intern("post step")
+
 
 @dataclass
 class TensorDef:
@@ -35,28 +51,28 @@ class BaseTracer:
             CURRENT_STAGE = stage
 
     def pre_forward_hook(self, m, i):
-        self.log_module_stage("pre forward", m)
-        self.process_hook(m, "pre forward")
+        self.log_pre(m, PRE_FORWARD, FORWARD)
+        self.process_hook(m, PRE_FORWARD)
 
     def post_forward_hook(self, m, i, o):
-        self.log_module_stage("post forward", m)
-        self.process_hook(m, "post forward")
+        self.log_post(m, POST_FORWARD, FORWARD)
+        self.process_hook(m, POST_FORWARD)
 
     def pre_backward_hook(self, m, i):
-        self.log_module_stage("pre backward", m)
-        self.process_hook(m, "pre backward")
+        self.log_pre(m, PRE_BACKWARD, BACKWARD)
+        self.process_hook(m, PRE_BACKWARD)
 
     def post_backward_hook(self, m, i, o):
-        self.log_module_stage("post backward", m)
-        self.process_hook(m, "post backward")
+        self.log_post(m, POST_BACKWARD, BACKWARD)
+        self.process_hook(m, POST_BACKWARD)
 
     def pre_step_hook(self, optimizer, args, kwargs):
-        self.log_module_stage("pre step", optimizer, force=False)
-        self.process_hook(optimizer, "pre step")
+        self.log_pre(optimizer, PRE_STEP, STEP)
+        self.process_hook(optimizer, PRE_STEP)
 
     def post_step_hook(self, optimizer, args, kwargs):
-        self.log_module_stage("post step", optimizer, force=False)
-        self.process_hook(optimizer, "post step")
+        self.log_post(optimizer, POST_STEP, STEP)
+        self.process_hook(optimizer, POST_STEP)
         global MODULE_CALL_OFFSET
         MODULE_CALL_OFFSET = 0
         next_step()
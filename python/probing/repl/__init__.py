@@ -154,7 +154,16 @@ class CodeExecutor:
     Kernel shut down.
     """
 
-    def __init__(self):
+    def __init__(self, text_only: bool = False):
+        """Start the in-process kernel.
+
+        Parameters
+        ----------
+        text_only : bool, default False
+            When True, restrict the shell's display formatter to
+            ``text/plain``. Callers that only read textual output (e.g.
+            magic listings) then skip rich MIME formatting entirely.
+        """
         import sys
 
         from ipykernel.inprocess.manager import InProcessKernelManager
@@ -172,6 +181,10 @@ class CodeExecutor:
 
         shell = self.km.kernel.shell
 
+        if text_only:
+            # Plain-text transport: skip HTML/PNG/LaTeX formatter dispatch
+            shell.display_formatter.active_types = ["text/plain"]
+
         # Copy original __main__ to kernel namespace
         if original_main:
             shell.user_ns.update(original_main.__dict__)
@@ -282,6 +295,85 @@ class CodeExecutor:
         result_text = "".join(output).strip()
         return ExecutionResult(status="ok", output=result_text)
 
+    def execute_many(
+        self, codes: List[Union[str, dict]]
+    ) -> List[ExecutionResult]:
+        """Executes several code strings and returns their results in order.
+
+        All requests are sent to the kernel before any replies are read, so
+        callers pay the send/receive bookkeeping once per batch instead of
+        once per cell. Output messages are matched back to their cell via
+        the parent message id, so interleaved output cannot bleed between
+        results.
+
+        Parameters
+        ----------
+        codes : list of str or dict
+            The cells to execute, each a code string or a ``{'code': ...}``
+            request dictionary.
+
+        Returns
+        -------
+        list of ExecutionResult
+            One result per cell, in the order submitted.
+
+        Examples
+        --------
+        >>> executor = CodeExecutor()
+        >>> first, second = executor.execute_many(["n = 1; n + 1", "n + 2"])
+        >>> first.output
+        '2'
+        >>> second.output
+        '3'
+        >>> executor.shutdown() # doctest: +ELLIPSIS
+        <BLANKLINE>
+        Shutting down kernel...
+        Kernel shut down.
+        """
+        requests = [
+            code if isinstance(code, dict) else {"code": code} for code in codes
+        ]
+
+        # Send everything first; the in-process kernel runs each cell as it
+        # is submitted
+        msg_ids = [self.kc.execute(request["code"], silent=False) for request in requests]
+
+        # Collect the shell replies, keyed by the request they answer
+        replies = {}
+        for _ in msg_ids:
+            reply = self.kc.get_shell_msg(timeout=5)
+            replies[reply["parent_header"]["msg_id"]] = reply["content"]
+
+        # Drain the IOPub channel once, routing output to the right cell
+        outputs = {msg_id: [] for msg_id in msg_ids}
+        while self.kc.iopub_channel.msg_ready():
+            sub_msg = self.kc.get_iopub_msg(timeout=5)
+            parent_id = sub_msg["parent_header"].get("msg_id")
+            if parent_id not in outputs:
+                continue
+            msg_type = sub_msg["header"]["msg_type"]
+            if msg_type == "stream":
+                outputs[parent_id].append(sub_msg["content"]["text"])
+            elif msg_type == "execute_result":
+                outputs[parent_id].append(
+                    sub_msg["content"]["data"].get("text/plain", "")
+                )
+
+        results = []
+        for msg_id in msg_ids:
+            content = replies.get(msg_id, {})
+            if content.get("status") == "error":
+                results.append(
+                    ExecutionResult(status="error", traceback=content["traceback"])
+                )
+            else:
+                results.append(
+                    ExecutionResult(
+                        status="ok", output="".join(outputs[msg_id]).strip()
+                    )
+                )
+        return results
+
     def shutdown(self):
         """Shuts down the kernel and its communication channels.
 
@@ -4,7 +4,6 @@ This module provides magic commands to trace Python function execution,
 watch variables, monitor function calls, and enable remote debugging.
 """
 
-import json
 from typing import Any, Dict
 
 from IPython.core.magic import Magics, cell_magic, line_magic, magics_class
@@ -207,9 +206,7 @@ Cell Magic (separate):
 
     def _cmd_trace_watch(self, args_str: str) -> None:
         """Handle trace watch subcommand - function trace or show mode."""
-        import json
-
-        from probing.inspect.trace import show_trace
+        from probing.inspect.trace import show_trace_native
         from probing.inspect.trace import trace as trace_func
 
         # Parse arguments
@@ -217,8 +214,7 @@ Cell Magic (separate):
 
         # No arguments = show mode
         if not parts:
-            result = show_trace()
-            traced = json.loads(result)
+            traced = show_trace_native()
             if not traced:
                 print("No functions are currently being watched.")
                 return
@@ -271,9 +267,7 @@ Cell Magic (separate):
 
     def _cmd_trace_log(self, args_str: str) -> None:
         """Handle trace log subcommand - similar to watch but silent (only saves to table)."""
-        import json
-
-        from probing.inspect.trace import show_trace
+        from probing.inspect.trace import show_trace_native
         from probing.inspect.trace import trace as trace_func
 
         # Parse arguments
@@ -281,8 +275,7 @@ Cell Magic (separate):
 
         # No arguments = show mode (same as watch)
         if not parts:
-            result = show_trace()
-            traced = json.loads(result)
+            traced = show_trace_native()
             if not traced:
                 print("No functions are currently being logged.")
                 return
@@ -351,10 +344,9 @@ Cell Magic (separate):
 
     def _cmd_trace_show(self) -> None:
         """Handle trace show subcommand."""
-        from probing.inspect.trace import show_trace
+        from probing.inspect.trace import show_trace_native
 
-        result = show_trace()
-        traced = json.loads(result)
+        traced = show_trace_native()
 
         if not traced:
             print("No functions are currently being watched.")
@@ -367,7 +359,7 @@ Cell Magic (separate):
 
     def _cmd_trace_list(self, args_str: str) -> None:
         """Handle trace list subcommand."""
-        from probing.inspect.trace import list_traceable as list_traceable_func
+        from probing.inspect.trace import list_traceable_native
 
         # Parse arguments - support both --prefix flag and direct prefix (shell-like)
         parts = args_str.strip().split()
@@ -400,8 +392,7 @@ Cell Magic (separate):
                 i += 1
 
         # Always returns variables by default
-        result = list_traceable_func(prefix=prefix)
-        items = json.loads(result)
+        items = list_traceable_native(prefix=prefix)
 
         if not items:
             prefix_msg = f" matching '{prefix}'" if prefix else ""
@@ -460,18 +451,22 @@ Cell Magic (separate):
             result = my_function(5)
         """
 
+        import textwrap
+
         args = parse_argstring(self.probe, line)
 
         # Execute the cell code in the user's namespace
-        # with probing enabled for all functions
-        exec_code = f"""
-from probing.inspect.trace import probe as _probe_decorator
-
-# Wrap execution in probe context
-_probing_tracer = _probe_decorator(watch={args.watch!r}, depth={args.depth})
-with _probing_tracer:
-{chr(10).join('    ' + line for line in cell.split(chr(10)))}
-"""
+        # with probing enabled for all functions; textwrap.indent does the
+        # body indentation in one pass instead of joining per-line strings
+        body = textwrap.indent(cell, "    ")
+        exec_code = (
+            "from probing.inspect.trace import probe as _probe_decorator\n"
+            "\n"
+            "# Wrap execution in probe context\n"
+            f"_probing_tracer = _probe_decorator(watch={args.watch!r}, depth={args.depth})\n"
+            "with _probing_tracer:\n"
+            f"{body}\n"
+        )
 
         self.shell.run_cell(exec_code)
 
@@ -4,16 +4,295 @@ This module provides a help system that uses introspection to
 automatically discover all registered magic commands.
 """
 
+import functools
+
 from IPython.core.magic import Magics, line_magic, magics_class
 
 from probing.repl import register_magic
 
+# Parsed (module, class_name, description, subcommands) per magic function,
+# keyed by id(func). Rebuilt whenever the magics table changes size so that
+# repeated %cmds invocations skip the per-docstring parsing work.
+_DESC_CACHE = {}
+_CACHE_SIG = None
+
+
+@functools.lru_cache(maxsize=2048)
+def _first_doc_line(doc):
+    """Return the first descriptive line of a magic docstring."""
+    for doc_line in doc.strip().split("\n"):
+        doc_line = doc_line.strip()
+        if (
+            doc_line
+            and not doc_line.startswith("Usage:")
+            and doc_line != "::"
+            and not doc_line.startswith("%")
+        ):
+            return doc_line
+    return "No description"
+
+
+def _parse_magic_doc(name, kind, doc):
+    """Extract description and Usage-section subcommands from a docstring.
+
+    Parameters
+    ----------
+    name : str
+        Magic command name.
+    kind : str
+        Either ``"line"`` or ``"cell"``.
+    doc : str
+        Raw docstring of the magic function.
+
+    Returns
+    -------
+    tuple
+        ``(description, subcommands)`` where subcommands is a list of strings.
+    """
+    description = _first_doc_line(doc)
+    subcommands = []
+
+    if kind == "line":
+        cmd_patterns = (f"%{name}", f"%%{name}", name)
+    else:
+        cmd_patterns = (f"%%{name}", f"%{name}", name)
+
+    in_usage = False
+    for doc_line in doc.strip().split("\n"):
+        doc_line = doc_line.strip()
+
+        # Detect Usage section
+        if doc_line.startswith("Usage:"):
+            in_usage = True
+            continue
+
+        if not in_usage:
+            continue
+
+        # Stop at Examples or other sections
+        if doc_line.startswith("Examples:") or doc_line.startswith("Subcommands:"):
+            in_usage = False
+            continue
+
+        # Skip empty lines (but continue in usage mode if we have subcommands)
+        if not doc_line:
+            if subcommands:
+                in_usage = False  # End of usage section
+            continue
+
+        # Skip comment-only lines
+        if doc_line.startswith("#"):
+            continue
+
+        # Check if this line contains the command name
+        subcmd_line = None
+        for pattern in cmd_patterns:
+            if pattern in doc_line:
+                # Extract everything after the command name
+                parts = doc_line.split(pattern, 1)
+                if len(parts) > 1:
+                    subcmd_line = parts[1].strip()
+                    # Remove inline comments (everything after #)
+                    if "#" in subcmd_line:
+                        subcmd_line = subcmd_line.split("#", 1)[0].strip()
+                    break
+
+        # If no command pattern found, but line looks like a subcommand
+        # (only applies to line magics, matching historical behaviour)
+        if kind == "line" and not subcmd_line and not doc_line.startswith("  "):
+            # Might be a subcommand line without the main command prefix
+            # Check if it looks like a subcommand (has common patterns)
+            if any(
+                word in doc_line.lower()
+                for word in [
+                    "watch",
+                    "list",
+                    "profile",
+                    "summary",
+                    "timeline",
+                    "ls",
+                    "gc",
+                    "cuda",
+                ]
+            ):
+                # Remove comments
+                subcmd_line = doc_line.split("#", 1)[0].strip()
+
+        if subcmd_line:
+            subcommands.append(subcmd_line)
+
+    return description, subcommands
+
+
+def _resolve_owner(func):
+    """Return the Magics instance owning func (bound method or MagicAlias)."""
+    owner = getattr(func, "__self__", None)
+    if owner is not None:
+        return owner
+    return getattr(func, "obj", None)
+
+
+def _collect(kind, magics_dict, show_all, magic_groups):
+    """Collect magics of one kind into magic_groups, using the parse cache."""
+    for name, func in magics_dict.items():
+        magic_obj = _resolve_owner(func)
+        if magic_obj is None:
+            # Skip magics that can't be introspected
+            continue
+
+        cached = _DESC_CACHE.get(id(func))
+        if cached is None:
+            module = magic_obj.__class__.__module__
+            class_name = magic_obj.__class__.__name__
+            doc = func.__doc__ or "No description"
+            description, subcommands = _parse_magic_doc(name, kind, doc)
+            cached = (module, class_name, description, subcommands)
+            _DESC_CACHE[id(func)] = cached
+
+        module, class_name, description, subcommands = cached
+
+        # Filter probing magics by module path
+        if not show_all and "probing" not in module:
+            continue
+
+        group = magic_groups.setdefault(class_name, {"line": [], "cell": []})
+        group[kind].append((name, description, subcommands))
+
+
+def format_magic_list(line_magics, cell_magics, show_all=False):
+    """Build the %cmds listing for the given magics tables.
+
+    Pure function over the line/cell magic dicts so it can be exercised
+    without a running IPython shell.
+
+    Parameters
+    ----------
+    line_magics : dict
+        Mapping of line-magic name to bound function.
+    cell_magics : dict
+        Mapping of cell-magic name to bound function.
+    show_all : bool, default False
+        Include magics from outside probing modules.
+
+    Returns
+    -------
+    str
+        The formatted command listing.
+    """
+    global _CACHE_SIG
+
+    # Invalidate the parse cache when the magics table changes
+    sig = (len(line_magics), len(cell_magics))
+    if sig != _CACHE_SIG:
+        _DESC_CACHE.clear()
+        _CACHE_SIG = sig
+
+    # Group magics by their class, scanning both kinds in one pass
+    magic_groups = {}
+    for kind, magics_dict in (("line", line_magics), ("cell", cell_magics)):
+        _collect(kind, magics_dict, show_all, magic_groups)
+
+    # Build output
+    title = "🔮 Probing Magic Commands" if not show_all else "🔮 All Magic Commands"
+    output = [title, "=" * 70, ""]
+
+    for class_name in sorted(magic_groups.keys()):
+        group = magic_groups[class_name]
+
+        # Extract nice name from class (e.g., QueryMagic -> Query)
+        display_name = class_name.replace("Magic", "")
+        output.append(f"📦 {display_name}")
+        output.append("-" * 70)
+
+        # Show line magics
+        for name, desc, subcommands in sorted(group["line"]):
+            # Truncate long descriptions
+            desc_short = desc[:50] + "..." if len(desc) > 50 else desc
+            output.append(f"  %{name:<25} {desc_short}")
+
+            # Show subcommands if available
+            if subcommands:
+                for subcmd in subcommands[:5]:  # Limit to 5 subcommands
+                    # Clean up subcommand line
+                    subcmd_clean = subcmd.strip()
+                    # Remove leading # if present
+                    if subcmd_clean.startswith("#"):
+                        subcmd_clean = subcmd_clean[1:].strip()
+                    # Truncate if too long
+                    if len(subcmd_clean) > 60:
+                        subcmd_clean = subcmd_clean[:57] + "..."
+                    output.append(f"    └─ %{name} {subcmd_clean}")
+                if len(subcommands) > 5:
+                    output.append(
+                        f"    └─ ... and {len(subcommands) - 5} more (use %{name}? for full help)"
+                    )
+
+        # Show cell magics
+        for name, desc, subcommands in sorted(group["cell"]):
+            desc_short = desc[:50] + "..." if len(desc) > 50 else desc
+            output.append(f"  %%{name:<24} {desc_short}")
+
+            # Show subcommands if available
+            if subcommands:
+                for subcmd in subcommands[:5]:
+                    subcmd_clean = subcmd.strip()
+                    if subcmd_clean.startswith("#"):
+                        subcmd_clean = subcmd_clean[1:].strip()
+                    if len(subcmd_clean) > 60:
+                        subcmd_clean = subcmd_clean[:57] + "..."
+                    output.append(f"    └─ %%{name} {subcmd_clean}")
+                if len(subcommands) > 5:
+                    output.append(
+                        f"    └─ ... and {len(subcommands) - 5} more (use %%{name}? for full help)"
+                    )
+
+        output.append("")
+
+    output.extend(
+        [
+            "💡 Tips:",
+            "  • Use %command? for detailed help",
+            "  • Use %%command? for cell magic help",
+            "  • Use Tab for auto-completion",
+        ]
+    )
+
+    if not show_all:
+        output.append("  • Use %cmds --all to see all IPython magics")
+
+    output.append("")
+    output.append("=" * 70)
+
+    return "\n".join(output)
+
 
 @register_magic("cmds")
 @magics_class
 class HelpMagic(Magics):
     """Magic commands for help and documentation."""
 
+    def __init__(self, shell=None, **kwargs):
+        super().__init__(shell=shell, **kwargs)
+        # Docstrings are immutable: parse them once at registration time so
+        # the first %cmds call is a pure table walk.
+        if shell is not None:
+            try:
+                self._warm_cache()
+            except Exception:
+                # Warming is best effort; %cmds repopulates lazily anyway
+                pass
+
+    def _warm_cache(self):
+        """Prepopulate the docstring parse cache from the magics manager."""
+        global _CACHE_SIG
+
+        magics = self.shell.magics_manager.magics
+        line_magics = magics.get("line", {})
+        cell_magics = magics.get("cell", {})
+        _CACHE_SIG = (len(line_magics), len(cell_magics))
+        for kind, magics_dict in (("line", line_magics), ("cell", cell_magics)):
+            _collect(kind, magics_dict, True, {})
+
     @line_magic
     def cmds(self, line: str):
         """List all available magic commands using introspection.
@@ -27,297 +306,9 @@ class HelpMagic(Magics):
         show_all = "--all" in line or "-a" in line
 
         # Get all registered magics from the shell
-        line_magics = self.shell.magics_manager.magics.get("line", {})
-        cell_magics = self.shell.magics_manager.magics.get("cell", {})
-
-        # Group magics by their class
-        magic_groups = {}
-
-        # Process line magics
-        for name, func in line_magics.items():
-            try:
-                # Handle MagicAlias and bound methods
-                if hasattr(func, "__self__"):
-                    magic_obj = func.__self__
-                elif hasattr(func, "obj"):
-                    magic_obj = func.obj
-                else:
-                    continue
-
-                # Filter probing magics by module path
-                module = magic_obj.__class__.__module__
-                if not show_all and "probing" not in module:
-                    continue
-
-                class_name = magic_obj.__class__.__name__
-                if class_name not in magic_groups:
-                    magic_groups[class_name] = {"line": [], "cell": []}
-
-                # Extract description and subcommands from docstring
-                doc = func.__doc__ or "No description"
-                description = "No description"
-                subcommands = []
-
-                # Parse docstring to extract description and subcommands
-                in_usage = False
-                for doc_line in doc.strip().split("\n"):
-                    doc_line = doc_line.strip()
-
-                    # Detect Usage section
-                    if doc_line.startswith("Usage:"):
-                        in_usage = True
-                        continue
-
-                    # Extract subcommands from Usage section
-                    if in_usage:
-                        # Stop at Examples or other sections
-                        if doc_line.startswith("Examples:") or doc_line.startswith(
-                            "Subcommands:"
-                        ):
-                            in_usage = False
-                            continue
-
-                        # Skip empty lines (but continue in usage mode if we have subcommands)
-                        if not doc_line:
-                            if subcommands:
-                                in_usage = False  # End of usage section
-                            continue
-
-                        # Skip comment-only lines
-                        if doc_line.startswith("#"):
-                            continue
-
-                        # Check if this line contains the command name
-                        cmd_patterns = [f"%{name}", f"%%{name}", name]
-                        subcmd_line = None
-
-                        for pattern in cmd_patterns:
-                            if pattern in doc_line:
-                                # Extract everything after the command name
-                                parts = doc_line.split(pattern, 1)
-                                if len(parts) > 1:
-                                    subcmd_line = parts[1].strip()
-                                    # Remove inline comments (everything after #)
-                                    if "#" in subcmd_line:
-                                        subcmd_line = subcmd_line.split("#", 1)[
-                                            0
-                                        ].strip()
-                                    break
-
-                        # If no command pattern found, but line looks like a subcommand (starts with common subcommands)
-                        if (
-                            not subcmd_line
-                            and doc_line
-                            and not doc_line.startswith("  ")
-                        ):
-                            # Might be a subcommand line without the main command prefix
-                            # Check if it looks like a subcommand (has common patterns)
-                            if any(
-                                word in doc_line.lower()
-                                for word in [
-                                    "watch",
-                                    "list",
-                                    "profile",
-                                    "summary",
-                                    "timeline",
-                                    "ls",
-                                    "gc",
-                                    "cuda",
-                                ]
-                            ):
-                                # Remove comments
-                                subcmd_line = doc_line.split("#", 1)[0].strip()
-
-                        if subcmd_line:
-                            subcommands.append(subcmd_line)
-                    else:
-                        # Extract first non-empty, non-usage, non-:: line as description
-                        if (
-                            doc_line
-                            and not doc_line.startswith("Usage:")
-                            and doc_line != "::"
-                            and not doc_line.startswith("%")
-                            and description == "No description"
-                        ):
-                            description = doc_line
-
-                magic_groups[class_name]["line"].append(
-                    (name, description, subcommands)
-                )
-            except (AttributeError, KeyError):
-                # Skip magics that can't be introspected
-                pass
-
-        # Process cell magics
-        for name, func in cell_magics.items():
-            try:
-                # Handle MagicAlias and bound methods
-                if hasattr(func, "__self__"):
-                    magic_obj = func.__self__
-                elif hasattr(func, "obj"):
-                    magic_obj = func.obj
-                else:
-                    continue
-
-                module = magic_obj.__class__.__module__
-                if not show_all and "probing" not in module:
-                    continue
-
-                class_name = magic_obj.__class__.__name__
-                if class_name not in magic_groups:
-                    magic_groups[class_name] = {"line": [], "cell": []}
-
-                doc = func.__doc__ or "No description"
-                description = "No description"
-                subcommands = []
-
-                # Parse docstring to extract description and subcommands
-                in_usage = False
-                for doc_line in doc.strip().split("\n"):
-                    doc_line = doc_line.strip()
-
-                    # Detect Usage section
-                    if doc_line.startswith("Usage:"):
-                        in_usage = True
-                        continue
-
-                    # Extract subcommands from Usage section
-                    if in_usage:
-                        # Stop at Examples or other sections
-                        if doc_line.startswith("Examples:") or doc_line.startswith(
-                            "Subcommands:"
-                        ):
-                            in_usage = False
-                            continue
-
-                        # Skip empty lines
-                        if not doc_line:
-                            if subcommands:
-                                in_usage = False
-                            continue
-
-                        # Skip comment-only lines
-                        if doc_line.startswith("#"):
-                            continue
-
-                        # Check if this line contains the command name
-                        cmd_patterns = [f"%%{name}", f"%{name}", name]
-                        subcmd_line = None
-
-                        for pattern in cmd_patterns:
-                            if pattern in doc_line:
-                                parts = doc_line.split(pattern, 1)
-                                if len(parts) > 1:
-                                    subcmd_line = parts[1].strip()
-                                    # Remove inline comments
-                                    if "#" in subcmd_line:
-                                        subcmd_line = subcmd_line.split("#", 1)[
-                                            0
-                                        ].strip()
-                                    break
-
-                        if subcmd_line:
-                            subcommands.append(subcmd_line)
-                    else:
-                        # Extract first non-empty line as description
-                        if (
-                            doc_line
-                            and not doc_line.startswith("Usage:")
-                            and doc_line != "::"
-                            and not doc_line.startswith("%")
-                            and description == "No description"
-                        ):
-                            description = doc_line
-
-                magic_groups[class_name]["cell"].append(
-                    (name, description, subcommands)
-                )
-            except (AttributeError, KeyError):
-                # Skip magics that can't be introspected
-                pass
-
-        # Build output
-        title = "🔮 Probing Magic Commands" if not show_all else "🔮 All Magic Commands"
-        output = [title, "=" * 70, ""]
-
-        for class_name in sorted(magic_groups.keys()):
-            group = magic_groups[class_name]
-
-            # Extract nice name from class (e.g., QueryMagic -> Query)
-            display_name = class_name.replace("Magic", "")
-            output.append(f"📦 {display_name}")
-            output.append("-" * 70)
-
-            # Show line magics
-            for item in sorted(group["line"]):
-                if len(item) == 3:
-                    name, desc, subcommands = item
-                else:
-                    # Backward compatibility
-                    name, desc = item[:2]
-                    subcommands = []
-
-                # Truncate long descriptions
-                desc_short = desc[:50] + "..." if len(desc) > 50 else desc
-                output.append(f"  %{name:<25} {desc_short}")
-
-                # Show subcommands if available
-                if subcommands:
-                    for subcmd in subcommands[:5]:  # Limit to 5 subcommands
-                        # Clean up subcommand line
-                        subcmd_clean = subcmd.strip()
-                        # Remove leading # if present
-                        if subcmd_clean.startswith("#"):
-                            subcmd_clean = subcmd_clean[1:].strip()
-                        # Truncate if too long
-                        if len(subcmd_clean) > 60:
-                            subcmd_clean = subcmd_clean[:57] + "..."
-                        output.append(f"    └─ %{name} {subcmd_clean}")
-                    if len(subcommands) > 5:
-                        output.append(
-                            f"    └─ ... and {len(subcommands) - 5} more (use %{name}? for full help)"
-                        )
-
-            # Show cell magics
-            for item in sorted(group["cell"]):
-                if len(item) == 3:
-                    name, desc, subcommands = item
-                else:
-                    name, desc = item[:2]
-                    subcommands = []
-
-                desc_short = desc[:50] + "..." if len(desc) > 50 else desc
-                output.append(f"  %%{name:<24} {desc_short}")
-
-                # Show subcommands if available
-                if subcommands:
-                    for subcmd in subcommands[:5]:
-                        subcmd_clean = subcmd.strip()
-                        if subcmd_clean.startswith("#"):
-                            subcmd_clean = subcmd_clean[1:].strip()
-                        if len(subcmd_clean) > 60:
-                            subcmd_clean = subcmd_clean[:57] + "..."
-                        output.append(f"    └─ %%{name} {subcmd_clean}")
-                    if len(subcommands) > 5:
-                        output.append(
-                            f"    └─ ... and {len(subcommands) - 5} more (use %%{name}? for full help)"
-                        )
-
-            output.append("")
-
-        output.extend(
-            [
-                "💡 Tips:",
-                "  • Use %command? for detailed help",
-                "  • Use %%command? for cell magic help",
-                "  • Use Tab for auto-completion",
-            ]
+        magics = self.shell.magics_manager.magics
+        print(
+            format_magic_list(
+                magics.get("line", {}), magics.get("cell", {}), show_all
+            )
         )
-
-        if not show_all:
-            output.append("  • Use %cmds --all to see all IPython magics")
-
-        output.append("")
-        output.append("=" * 70)
-
-        print("\n".join(output))
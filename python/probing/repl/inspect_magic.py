@@ -4,12 +4,25 @@ This module provides a unified %inspect command to inspect PyTorch objects,
 memory usage, and runtime state.
 """
 
+import functools
+import gc
+import sys
+from collections import Counter
+
 from IPython.core.magic import Magics, line_magic, magics_class
 from IPython.core.magic_arguments import argument, magic_arguments, parse_argstring
 
 from probing.repl import register_magic
 
 
+@functools.lru_cache(maxsize=1)
+def _cuda_device_names():
+    """Snapshot CUDA device names once; they are immutable for the process."""
+    import torch
+
+    return [torch.cuda.get_device_name(i) for i in range(torch.cuda.device_count())]
+
+
 @register_magic("inspect")
 @magics_class
 class InspectMagic(Magics):
@@ -41,6 +54,11 @@ class InspectMagic(Magics):
         action="store_true",
         help="Show all modules including submodules (for modules target)",
     )
+    @argument(
+        "--show-size",
+        action="store_true",
+        help="Compute per-type memory sizes (slow, objects target only)",
+    )
     def inspect(self, line: str):
         """Inspect PyTorch modules, tensors, optimizers, and memory.
 
@@ -51,22 +69,21 @@ class InspectMagic(Magics):
 
         subcommand = args.subcommand.lower()
 
-        # Handle aliases
-        if subcommand == "list":
-            subcommand = "ls"
-
-        if subcommand == "help" or (subcommand == "ls" and not args.target):
-            self._show_help()
-        elif subcommand == "ls":
-            self._handle_list(args)
-        elif subcommand == "gc":
-            self._handle_gc()
-        elif subcommand == "cuda":
-            self._handle_cuda()
-        else:
+        handler = self._SUBCOMMANDS.get(subcommand)
+        if handler is None:
             print(
                 f"Unknown subcommand: {args.subcommand}\n\nUse '%inspect help' for usage."
             )
+            return
+
+        # 'ls' without a target falls back to the help screen
+        if handler == "_handle_list":
+            if args.target:
+                self._handle_list(args)
+            else:
+                self._show_help()
+        else:
+            getattr(self, handler)()
 
     def _show_help(self):
         """Show help message."""
@@ -94,6 +111,7 @@ Options:
   -d, --device DEV      Filter by device (tensors only)
   -t, --type TYPE       Filter by type (objects only)
   --all                 Show all modules including submodules (modules only, default: top-level only)
+  --show-size           Compute per-type memory sizes (slow, objects only)
 
 Examples:
   %inspect ls modules                  # Show top-level modules only
@@ -107,6 +125,23 @@ Examples:
 """
         )
 
+    # Dispatch table for %inspect subcommands ('list' aliases 'ls')
+    _SUBCOMMANDS = {
+        "list": "_handle_list",
+        "ls": "_handle_list",
+        "gc": "_handle_gc",
+        "cuda": "_handle_cuda",
+        "help": "_show_help",
+    }
+
+    # Dispatch table for 'ls' targets (resolved to bound methods at call time)
+    _LS_HANDLERS = {
+        "modules": "_list_modules",
+        "tensors": "_list_tensors",
+        "optimizers": "_list_optimizers",
+        "objects": "_list_objects",
+    }
+
     def _handle_list(self, args):
         """Handle list subcommand."""
         target = args.target.lower() if args.target else None
@@ -117,25 +152,25 @@ Examples:
             )
             return
 
-        if target == "modules":
-            self._list_modules(args)
-        elif target == "tensors":
-            self._list_tensors(args)
-        elif target == "optimizers":
-            self._list_optimizers(args)
-        elif target == "objects":
-            self._list_objects(args)
-        else:
+        handler = self._LS_HANDLERS.get(target)
+        if handler is None:
             print(
                 f"Unknown target: {target}\n\nValid targets: modules, tensors, optimizers, objects"
             )
+            return
+
+        getattr(self, handler)(args)
 
     def _list_modules(self, args):
         """List PyTorch modules. Default shows only top-level modules."""
         try:
-            import gc
-
-            import torch
+            # If torch was never imported nothing can be a torch.nn.Module,
+            # so skip the (potentially multi-second) torch import entirely.
+            torch = sys.modules.get("torch")
+            if torch is None:
+                module_type = "" if args.all else "top-level "
+                print(f"No {module_type}PyTorch modules found in memory.")
+                return
 
             if args.all:
                 # Get all modules including submodules
@@ -181,7 +216,7 @@ Examples:
                 except:
                     output.append(f"  {i}. {module_type} (id: {module_id})")
 
-            print("\n".join(output))
+            print(*output, sep="\n")
         except ImportError:
             print("✗ PyTorch is not available")
         except Exception as e:
@@ -193,9 +228,9 @@ Examples:
         Returns:
             List of tuples (module, module_id) for top-level torch.nn.Module instances.
         """
-        import gc
-
-        import torch
+        torch = sys.modules.get("torch")
+        if torch is None:
+            return []
 
         try:
             objs = gc.get_objects()
@@ -229,7 +264,13 @@ Examples:
     def _list_tensors(self, args):
         """List PyTorch tensors."""
         try:
-            import torch
+            torch = sys.modules.get("torch")
+            if torch is None:
+                msg = "No PyTorch tensors found"
+                if args.device:
+                    msg += f" on device '{args.device}'"
+                print(msg + ".")
+                return
 
             from probing.inspect import get_torch_tensors
 
@@ -261,24 +302,29 @@ Examples:
                 print(msg + ".")
                 return
 
-            # Calculate total memory usage
-            total_bytes = sum(t.numel() * t.element_size() for t in tensors)
+            # Single pass: compute per-tensor byte counts once and reuse them
+            # for both the total and the per-row output.
+            rows = []
+            total_bytes = 0
+            for tensor in tensors:
+                nbytes = tensor.numel() * tensor.element_size()
+                total_bytes += nbytes
+                rows.append((tuple(tensor.shape), tensor.dtype, tensor.device, nbytes))
+
             total_mb = total_bytes / (1024 * 1024)
 
             output = [f"Found {len(tensors)} tensor(s) using ~{total_mb:.2f} MB:", ""]
 
-            for i, tensor in enumerate(tensors, 1):
-                shape = tuple(tensor.shape)
-                dtype = str(tensor.dtype).replace("torch.", "")
-                device = str(tensor.device)
-                size_mb = (tensor.numel() * tensor.element_size()) / (1024 * 1024)
+            for i, (shape, dtype, device, nbytes) in enumerate(rows, 1):
+                dtype = str(dtype).replace("torch.", "")
+                size_mb = nbytes / (1024 * 1024)
 
                 output.append(
                     f"  {i}. shape={shape} dtype={dtype} device={device} "
                     f"size={size_mb:.2f}MB"
                 )
 
-            print("\n".join(output))
+            print(*output, sep="\n")
         except ImportError:
             print("✗ PyTorch is not available")
         except Exception as e:
@@ -287,7 +333,10 @@ Examples:
     def _list_optimizers(self, args):
         """List PyTorch optimizers."""
         try:
-            import torch
+            torch = sys.modules.get("torch")
+            if torch is None:
+                print("No PyTorch optimizers found in memory.")
+                return
 
             from probing.inspect import get_torch_optimizers
 
@@ -323,7 +372,7 @@ Examples:
                     f"param_groups: {num_param_groups})"
                 )
 
-            print("\n".join(output))
+            print(*output, sep="\n")
         except ImportError:
             print("✗ PyTorch is not available")
         except Exception as e:
@@ -331,55 +380,69 @@ Examples:
 
     def _list_objects(self, args):
         """List objects in memory grouped by type."""
-        import gc
-        import sys
-        from collections import defaultdict
-
-        # Collect all objects
-        objects = gc.get_objects()
+        # Restrict the walk to generation 2 when only a top-N summary is
+        # requested: gen-0/1 hold short-lived churn that rarely matters and
+        # skipping them avoids an O(heap) stall on large processes.
+        if args.limit and not args.type:
+            objects = gc.get_objects(generation=2)
+        else:
+            objects = gc.get_objects()
 
-        # Filter by type if specified
+        # Filter by type if specified. Pre-split a dotted filter once so the
+        # per-object check is plain attribute comparison, never an f-string.
         if args.type:
-            objects = [
-                obj
-                for obj in objects
-                if type(obj).__name__ == args.type
-                or f"{type(obj).__module__}.{type(obj).__name__}" == args.type
-            ]
-
-        # Group by type and count
-        type_counts = defaultdict(int)
-        type_sizes = defaultdict(int)
-
-        for obj in objects:
-            type_name = f"{type(obj).__module__}.{type(obj).__name__}"
-            type_counts[type_name] += 1
-            try:
-                type_sizes[type_name] += sys.getsizeof(obj)
-            except:
-                pass
-
-        # Sort by count
-        sorted_types = sorted(type_counts.items(), key=lambda x: x[1], reverse=True)
-
-        if args.limit:
-            sorted_types = sorted_types[: args.limit]
+            filtered = []
+            if "." in args.type:
+                mod, name = args.type.rsplit(".", 1)
+                for obj in objects:
+                    type_ = type(obj)
+                    if type_.__name__ == name and type_.__module__ == mod:
+                        filtered.append(obj)
+            else:
+                name = args.type
+                for obj in objects:
+                    if type(obj).__name__ == name:
+                        filtered.append(obj)
+            objects = filtered
+
+        # Aggregate on type objects (pointer hash); the qualified name string
+        # is only built for the rows that survive the top-N cut below.
+        type_counts = Counter(map(type, objects))
+
+        type_sizes = {}
+        if args.show_size:
+            getsizeof = sys.getsizeof
+            for obj in objects:
+                type_ = type(obj)
+                try:
+                    type_sizes[type_] = type_sizes.get(type_, 0) + getsizeof(obj)
+                except:
+                    pass
+
+        # Top-k by count; most_common uses a heap, cheaper than a full sort
+        sorted_types = type_counts.most_common(args.limit)
 
         output = [f"Object types in memory (showing top {len(sorted_types)}):"]
         output.append("")
-        output.append(f"{'Type':<50} {'Count':>10} {'Size (MB)':>12}")
-        output.append("-" * 75)
-
-        for type_name, count in sorted_types:
-            size_mb = type_sizes[type_name] / (1024 * 1024)
-            output.append(f"{type_name:<50} {count:>10} {size_mb:>12.2f}")
+        if args.show_size:
+            output.append(f"{'Type':<50} {'Count':>10} {'Size (MB)':>12}")
+            output.append("-" * 75)
+        else:
+            output.append(f"{'Type':<50} {'Count':>10}")
+            output.append("-" * 61)
+
+        for type_, count in sorted_types:
+            type_name = f"{type_.__module__}.{type_.__name__}"
+            if args.show_size:
+                size_mb = type_sizes.get(type_, 0) / (1024 * 1024)
+                output.append(f"{type_name:<50} {count:>10} {size_mb:>12.2f}")
+            else:
+                output.append(f"{type_name:<50} {count:>10}")
 
-        print("\n".join(output))
+        print(*output, sep="\n")
 
     def _handle_gc(self):
         """Handle garbage collection."""
-        import gc
-
         before = len(gc.get_objects())
         collected = gc.collect()
         after = len(gc.get_objects())
@@ -404,8 +467,7 @@ Examples:
             output = ["CUDA Memory Status:"]
             output.append("")
 
-            for i in range(torch.cuda.device_count()):
-                device_name = torch.cuda.get_device_name(i)
+            for i, device_name in enumerate(_cuda_device_names()):
                 allocated = torch.cuda.memory_allocated(i) / (1024**3)
                 reserved = torch.cuda.memory_reserved(i) / (1024**3)
                 max_allocated = torch.cuda.max_memory_allocated(i) / (1024**3)
@@ -416,19 +478,19 @@ Examples:
                 output.append(f"  Max allocated: {max_allocated:.2f} GB")
                 output.append("")
 
-            print("\n".join(output))
+            print(*output, sep="\n")
         except ImportError:
             print("✗ PyTorch is not available")
         except Exception as e:
             print(f"✗ Failed to get CUDA memory info: {e}")
 
-    # Aliases for convenience
+    # Aliases for convenience (direct dispatch, no argparse round-trip)
     @line_magic
     def gc_collect(self, line: str):
         """Force garbage collection. Alias for %inspect gc."""
-        self.inspect("gc")
+        self._handle_gc()
 
     @line_magic
     def cuda_memory(self, line: str):
         """Show CUDA memory usage. Alias for %inspect cuda."""
-        self.inspect("cuda")
+        self._handle_cuda()
@@ -4,13 +4,45 @@ This module provides magic commands to execute queries and manage
 extensions in the probing system.
 """
 
-import pandas as pd
+import functools
+
 from IPython.core.magic import Magics, line_magic, magics_class
 from IPython.core.magic_arguments import argument, magic_arguments, parse_argstring
 from IPython.display import display
 
 from probing.repl import register_magic
 
+# Engine module resolved on first use; queries go through an attribute
+# lookup so monkeypatching probing.core.engine.query keeps working.
+_engine = None
+
+
+def _engine_query(sql: str):
+    """Execute a query via the lazily resolved engine module."""
+    global _engine
+    if _engine is None:
+        from probing.core import engine
+
+        _engine = engine
+    return _engine.query(sql)
+
+
+def _maybe_display(df):
+    """Display a DataFrame, slicing very large results before rendering.
+
+    _repr_html_ renders the whole frame even though pandas elides the
+    middle beyond display.max_rows; slicing head+tail first keeps display
+    time proportional to what actually ends up on screen.
+    """
+    import pandas as pd
+
+    max_rows = pd.get_option("display.max_rows") or 60
+    if len(df) <= max_rows:
+        display(df)
+    else:
+        half = max(max_rows // 2, 1)
+        display(pd.concat([df.head(half), df.tail(half)]))
+
 
 @register_magic("query")
 @magics_class
@@ -29,15 +61,15 @@ class QueryMagic(Magics):
         Short form:
             %q SELECT * FROM my_table LIMIT 10
         """
-        from probing.core.engine import query as query_func
-
         if not line.strip():
             return "Error: Query cannot be empty"
 
+        import pandas as pd
+
         try:
-            result = query_func(line)
+            result = _engine_query(line)
             if isinstance(result, pd.DataFrame):
-                display(result)
+                _maybe_display(result)
                 return result
             else:
                 print(result)
@@ -67,10 +99,12 @@ class QueryMagic(Magics):
         """
         from probing.core.engine import load_extension
 
-        args = parse_argstring(self.load_ext, line)
+        args = _parse_cached("load_ext", line)
 
         try:
             result = load_extension(args.extension)
+            # New extensions may register new tables/magics; drop stale parses
+            _parse_cached.cache_clear()
             return f"✓ Extension loaded: {args.extension}"
         except Exception as e:
             return f"✗ Failed to load extension {args.extension}: {e}"
@@ -82,12 +116,12 @@ class QueryMagic(Magics):
         Usage:
             %tables
         """
-        from probing.core.engine import query as query_func
+        import pandas as pd
 
         try:
-            result = query_func("SHOW TABLES")
+            result = _engine_query("SHOW TABLES")
             if isinstance(result, pd.DataFrame):
-                display(result)
+                _maybe_display(result)
                 return result
             else:
                 print(result)
@@ -104,14 +138,14 @@ class QueryMagic(Magics):
         Usage:
             %describe my_table
         """
-        from probing.core.engine import query as query_func
+        import pandas as pd
 
-        args = parse_argstring(self.describe, line)
+        args = _parse_cached("describe", line)
 
         try:
-            result = query_func(f"DESCRIBE {args.table_name}")
+            result = _engine_query(f"DESCRIBE {args.table_name}")
             if isinstance(result, pd.DataFrame):
-                display(result)
+                _maybe_display(result)
                 return result
             else:
                 print(result)
@@ -123,6 +157,12 @@ class QueryMagic(Magics):
     @magic_arguments()
     @argument("table_name", type=str, help="Table name")
     @argument("--limit", "-n", type=int, default=10, help="Number of rows to show")
+    @argument(
+        "--text",
+        "-t",
+        action="store_true",
+        help="Render with to_string instead of the HTML display path",
+    )
     def peek(self, line: str):
         """Quick peek at table data.
 
@@ -130,18 +170,38 @@ class QueryMagic(Magics):
             %peek my_table
             %peek my_table --limit 20
             %peek my_table -n 50
+            %peek my_table --text
         """
-        from probing.core.engine import query as query_func
+        import pandas as pd
 
-        args = parse_argstring(self.peek, line)
+        args = _parse_cached("peek", line)
 
         try:
-            result = query_func(f"SELECT * FROM {args.table_name} LIMIT {args.limit}")
+            result = _engine_query(f"SELECT * FROM {args.table_name} LIMIT {args.limit}")
             if isinstance(result, pd.DataFrame):
-                display(result)
+                if args.text:
+                    print(result.to_string(max_rows=args.limit))
+                    return result
+                _maybe_display(result)
                 return result
             else:
                 print(result)
                 return result
         except Exception as e:
             return f"✗ Failed to peek table: {e}"
+
+    @staticmethod
+    def _parse_peek_args(line: str):
+        """Parse a %peek argument line into ``(table_name, limit)``."""
+        args = _parse_cached("peek", line)
+        return args.table_name, args.limit
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_cached(magic_key: str, line: str):
+    """Memoized parse_argstring keyed by (magic name, raw line).
+
+    Interactive sessions tend to repeat the same magic lines; caching the
+    parsed namespace skips argparse tokenization on those repeats.
+    """
+    return parse_argstring(getattr(QueryMagic, magic_key), line)
@@ -36,9 +36,14 @@ Implicit name decorator::
         return 42
 """
 
+import atexit
 import functools
-import inspect
+import json
+import sys
+import threading
+import warnings
 from dataclasses import dataclass
+from time import time_ns
 from typing import Callable, Optional
 
 # Import from the internal Rust module
@@ -52,40 +57,170 @@ except AttributeError:
     Span = None
     span_raw = None
     current_span = lambda: None
+
+# Resolved once at import so span creation skips a per-span hasattr probe;
+# _set_initial_attrs is a regular method on the extension's Span class.
+_HAS_SET_ATTRS = Span is not None and hasattr(Span, "_set_initial_attrs")
+
+# A deterministic _set_initial_attrs failure (e.g. an unsupported value
+# type) would otherwise pay warning-filter matching and formatting on
+# every span; warn once per process instead.
+_ATTR_WARNED = False
 from probing.core.table import table
 
+# Native recorders: builds of the extension that ship record_span_start /
+# record_span_end / record_event can persist a row while reading the Span
+# fields on the Rust side, without one FFI getter call per column. Current
+# builds don't expose them, so these resolve to None and the pure-Python
+# recorders below are used.
+_native_record_span_start = getattr(_core, "record_span_start", None)
+_native_record_span_end = getattr(_core, "record_span_end", None)
+_native_record_event = getattr(_core, "record_event", None)
+# Preferred over record_span_end when available: end rows carry only three
+# live fields (span id, end timestamp, thread id), so this variant marshals
+# three scalars and lets Rust fill the empty columns from a template.
+_native_record_span_end_minimal = getattr(_core, "record_span_end_minimal", None)
+# Preferred over record_span_start for the common attribute-less case
+# (bare @span decorators): skips passing the attrs argument entirely.
+_native_record_span_start_no_attrs = getattr(_core, "record_span_start_no_attrs", None)
+
+# Trace rows are allocated per span/event; a slotted dataclass drops the
+# per-instance __dict__, which adds up once rows are buffered in batches.
+# dataclass(slots=True) needs 3.10+, so fall back to a plain dataclass.
+if sys.version_info >= (3, 10):
+    _row_dataclass = dataclass(slots=True)
+else:
+    _row_dataclass = dataclass
+
+# Location capture is on by default; the whole stack walk can be switched
+# off via the "probing.tracing.capture_location" config key or at runtime
+# with set_location_capture().
+_LOCATION_ENABLED = True
+
+
+def set_location_capture(enabled: bool) -> None:
+    """Toggle call-site capture for spans at runtime.
+
+    Parameters
+    ----------
+    enabled : bool
+        When False, spans record an empty location and skip the stack walk.
+    """
+    global _LOCATION_ENABLED
+    _LOCATION_ENABLED = bool(enabled)
+
+
+def _init_location_capture() -> None:
+    """Honor the config surface at import time (best effort)."""
+    try:
+        import probing.config as config
+
+        value = config.get_str("probing.tracing.capture_location")
+    except Exception:
+        return
+    if isinstance(value, str) and value.lower() in ("0", "false", "off", "no"):
+        set_location_capture(False)
+
+
+_init_location_capture()
+
+# Attribute serialization: prefer orjson's C encoder when present, and
+# memoize the result for repeated identical attribute dicts (spans created
+# in loops typically reuse the same few shapes).
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
 
-def _get_location() -> Optional[str]:
+    def _dumps(obj) -> str:
+        return json.dumps(obj)
+
+
+@functools.lru_cache(maxsize=1024)
+def _dumps_items(items: tuple) -> str:
+    """Serialize a tuple of (key, value) pairs, cached per distinct tuple."""
+    return _dumps(dict(items))
+
+
+def _attrs_json(attrs: dict) -> str:
+    """JSON-encode an attribute dict, reusing cached encodings.
+
+    The cache key is the dict's insertion-order items: keyword arguments
+    at a given call site always arrive in the same order, so repeats hit
+    without paying a per-call sort, and the stored JSON keeps the caller's
+    key order.
+    """
+    try:
+        return _dumps_items(tuple(attrs.items()))
+    except TypeError:
+        # Unhashable values can't be cached; serialize directly
+        return _dumps(attrs)
+
+
+# Frames from this module share the same interned co_filename object, so an
+# identity check against __file__ skips them with one pointer compare; the
+# substring probes remain as a fallback for path normalization differences.
+_THIS_FILE = __file__
+_TRACING_FILE_POSIX = "probing/tracing.py"
+_TRACING_FILE_WIN = "probing\\tracing.py"
+
+
+@functools.lru_cache(maxsize=512)
+def _format_location(filename: str, funcname: str, lineno: int) -> str:
+    """Format a call site, cached so repeated sites reuse one string.
+
+    A decorated function called in a loop hits the same (file, function,
+    line) triple on every iteration; caching makes each repeat a lookup
+    instead of a fresh string allocation, and the shared object keeps the
+    later interning of row fields a no-op.
+    """
+    return f"{filename}:{funcname}:{lineno}"
+
+
+def _get_location(
+    *,
+    _getframe=sys._getframe,
+    _this_file=_THIS_FILE,
+    _posix=_TRACING_FILE_POSIX,
+    _win=_TRACING_FILE_WIN,
+) -> Optional[str]:
     """Get the current call location from the stack.
 
+    Walks raw frames via ``sys._getframe``/``f_back`` instead of
+    ``inspect.stack()``, which materializes FrameInfo objects and stats
+    source files for every frame on the stack. The keyword-only defaults
+    pre-bind module globals so the loop resolves them as locals.
+
     Returns
     -------
     Optional[str]
         Location string in format "filename:function:lineno" or None if unavailable.
     """
+    if not _LOCATION_ENABLED:
+        return None
     try:
-        # Get the frame that called span() (skip this function and span() itself)
-        stack = inspect.stack()
-        # Find the first frame that's not in this module
-        for frame_info in stack[2:]:  # Skip _get_location and span()
-            frame = frame_info.frame
-            filename = frame_info.filename
-            function = frame_info.function
-            lineno = frame_info.lineno
-
-            # Skip frames from this module
-            if "probing/tracing.py" in filename or "probing\\tracing.py" in filename:
+        # Start at the caller of _get_location, then skip frames from this
+        # module (span() and its wrappers) to find the user call site
+        f = _getframe(1)
+        while f is not None:
+            code = f.f_code
+            filename = code.co_filename
+            if filename is _this_file or _posix in filename or _win in filename:
+                f = f.f_back
                 continue
 
             # Format: "filename:function:lineno"
-            return f"{filename}:{function}:{lineno}"
+            return _format_location(filename, code.co_name, f.f_lineno)
     except Exception:
         pass
     return None
 
 
 @table
-@dataclass
+@_row_dataclass
 class TraceEvent:
     """Row model for trace records.
 
@@ -131,6 +266,38 @@ class TraceEvent:
     event_attributes: Optional[str] = ""
 
 
+# Rows are buffered per thread as plain field tuples (TraceEvent field
+# order) and appended to the table in batches, so a burst of spans/events
+# pays one table crossing per _BATCH_SIZE rows instead of one per row and
+# never materializes row objects at all. Buffers drain on root-span end,
+# when full, and at interpreter exit.
+_BATCH_SIZE = 64
+_PENDING = threading.local()
+
+
+def _buffer_row(row: tuple, *, _pending=_PENDING, _batch=_BATCH_SIZE) -> None:
+    buf = getattr(_pending, "buf", None)
+    if buf is None:
+        buf = _pending.buf = []
+    buf.append(row)
+    if len(buf) >= _batch:
+        flush_events()
+
+
+def flush_events() -> None:
+    """Flush this thread's buffered trace rows in a single table append."""
+    buf = getattr(_PENDING, "buf", None)
+    if not buf:
+        return
+    # Swap in a fresh list rather than copy-and-clear; the drained list is
+    # handed to the table append outright
+    _PENDING.buf = []
+    TraceEvent.append_many_rows(buf)
+
+
+atexit.register(flush_events)
+
+
 def span(*args, **kwargs):
     """Factory for span usage as context manager or decorator.
 
@@ -170,17 +337,21 @@ def span(*args, **kwargs):
     """
     # Extract special parameters
     kind = kwargs.pop("kind", None)
-    # Location is automatically captured, not passed as parameter
-    location = _get_location()
+    # Location is captured lazily at the true call site (context entry or
+    # wrapped-function call), never here: for decorators this frame is the
+    # decoration site, and capturing both would walk the stack twice.
 
     if len(args) == 0 and not kwargs:
 
         def decorator(func: Callable) -> Callable:
+            # Resolve the span name at decoration time, not per call
+            span_name = func.__name__
+
             @functools.wraps(func)
             def wrapper(*wargs, **wkwargs):
                 # Get location from the decorator's call site
-                loc = _get_location()
-                with span_raw(func.__name__, kind=kind, location=loc) as s:
+                loc = _get_location() if _LOCATION_ENABLED else None
+                with span_raw(span_name, kind=kind, location=loc) as s:
                     return func(*wargs, **wkwargs)
 
             return wrapper
@@ -190,12 +361,14 @@ def span(*args, **kwargs):
     # Handle @span(func) - first arg is a callable
     if len(args) == 1 and callable(args[0]):
         func = args[0]
+        # Resolve the span name at decoration time, not per call
+        span_name = func.__name__
 
         @functools.wraps(func)
         def wrapper(*wargs, **wkwargs):
             # Get location from the decorator's call site
-            loc = _get_location()
-            with span_raw(func.__name__, kind=kind, location=loc) as s:
+            loc = _get_location() if _LOCATION_ENABLED else None
+            with span_raw(span_name, kind=kind, location=loc) as s:
                 return func(*wargs, **wkwargs)
 
         return wrapper
@@ -235,13 +408,11 @@ def span(*args, **kwargs):
 
                 @functools.wraps(func)
                 def wrapper(*wargs, **wkwargs):
-                    loc = _get_location()
+                    loc = _get_location() if _LOCATION_ENABLED else None
                     if self.attrs:
-                        with span(
-                            self.name,
-                            kind=self.kind,
-                            **self.attrs,
-                        ) as s:
+                        # Reuse loc instead of re-entering span(), which
+                        # would capture the location a second time
+                        with SpanWrapper(self.name, self.kind, loc, self.attrs):
                             return func(*wargs, **wkwargs)
                     else:
                         with span_raw(self.name, kind=self.kind, location=loc) as s:
@@ -258,7 +429,9 @@ def span(*args, **kwargs):
                     The underlying span instance.
                 """
                 parent = current_span()
-                loc = self.location or _get_location()
+                loc = self.location or (
+                    _get_location() if _LOCATION_ENABLED else None
+                )
 
                 if parent:
                     self._span = Span.new_child(
@@ -267,18 +440,26 @@ def span(*args, **kwargs):
                 else:
                     self._span = Span(self.name, kind=self.kind, location=loc)
 
-                if self.attrs:
-                    attrs_dict = dict(self.attrs)
-                    if hasattr(self._span, "_set_initial_attrs"):
-                        try:
-                            self._span._set_initial_attrs(attrs_dict)
-                        except Exception as e:
-                            import warnings
-
+                if self.attrs and _HAS_SET_ATTRS:
+                    try:
+                        self._span._set_initial_attrs(dict(self.attrs))
+                    except Exception as e:
+                        global _ATTR_WARNED
+                        if not _ATTR_WARNED:
+                            _ATTR_WARNED = True
                             warnings.warn(f"Failed to set initial attributes: {e}")
 
                 self._span.__enter__()
-                _record_span_start(self._span, self.attrs)
+                # The wrapper created the span, so name/kind/location are
+                # already in hand; passing them skips three getter
+                # crossings back into the extension
+                _record_span_start(
+                    self._span,
+                    self.attrs,
+                    name=self.name,
+                    kind=self.kind or "",
+                    location=loc or "",
+                )
 
                 return self._span
 
@@ -290,7 +471,8 @@ def span(*args, **kwargs):
                     return result
                 return False
 
-        return SpanWrapper(name, kind, location, kwargs)
+        # Location intentionally deferred to __enter__/__call__
+        return SpanWrapper(name, kind, None, kwargs)
 
     if len(args) > 0:
         name = args[0]
@@ -298,24 +480,95 @@ def span(*args, **kwargs):
             raise TypeError("span() requires a string name as the first argument")
 
         parent = current_span()
-        loc = location or _get_location()
+        loc = _get_location() if _LOCATION_ENABLED else None
 
         if parent:
             span_obj = Span.new_child(parent, name, kind=kind, location=loc)
         else:
             span_obj = Span(name, kind=kind, location=loc)
 
-        if kwargs:
-            attrs_dict = dict(kwargs)
-            if hasattr(span_obj, "_set_initial_attrs"):
-                span_obj._set_initial_attrs(attrs_dict)
+        if kwargs and _HAS_SET_ATTRS:
+            span_obj._set_initial_attrs(dict(kwargs))
 
         return span_obj
 
     raise TypeError("span() requires at least one argument")
 
 
-def _record_span_start(span: Span, attrs: dict):
+# Span fields are immutable after creation, but every read of them is a
+# PyO3 getter that locks the underlying span. Read them once when the span
+# start is recorded and reuse the tuple for every later row; entries are
+# dropped again when the span end is recorded, so the dict only holds live
+# spans.
+_SPAN_CTX = {}
+
+# Spans never migrate between threads (the Rust span stack is
+# thread-local), so every span created on a thread reports the same
+# thread_id. Read it once per thread from the first span seen instead of
+# running the getattr descriptor lookup for each new span.
+_TID = threading.local()
+
+
+def _thread_id(span: Span) -> int:
+    """Return the thread id for rows on this thread, cached per thread."""
+    tid = getattr(_TID, "v", None)
+    if tid is None:
+        tid = _TID.v = getattr(span, "thread_id", 0)
+    return tid
+
+
+def _span_ctx(
+    span: Span,
+    kind: Optional[str] = None,
+    location: Optional[str] = None,
+    *,
+    _intern=sys.intern,
+) -> tuple:
+    """Read a span's immutable fields once into a plain tuple.
+
+    Parameters
+    ----------
+    span : Span
+        Span object.
+    kind, location : str, optional
+        Already-known field values; when given, the corresponding PyO3
+        getter is not called at all. Callers that created the span (the
+        wrapper) know both without asking the span back.
+
+    Returns
+    -------
+    tuple
+        ``(trace_id, span_id, parent_id, kind, location, thread_id)`` with
+        ``None`` fields already coalesced to table-friendly sentinels.
+        Names, kinds and call sites repeat for every iteration of a traced
+        loop; interning collapses them to shared instances.
+    """
+    # Span ids are a counter starting above zero, so `or` never clobbers a
+    # real parent id; the remaining sentinels are all falsy-equivalent
+    if kind is None:
+        kind = span.kind or ""
+    if location is None:
+        location = getattr(span, "location", None) or ""
+    return (
+        span.trace_id,
+        span.span_id,
+        span.parent_id or -1,
+        _intern(kind),
+        _intern(location),
+        _thread_id(span),
+    )
+
+
+def _record_span_start(
+    span: Span,
+    attrs: dict,
+    name: Optional[str] = None,
+    kind: Optional[str] = None,
+    location: Optional[str] = None,
+    *,
+    _ctxs=_SPAN_CTX,
+    _intern=sys.intern,
+):
     """Persist span start.
 
     Parameters
@@ -324,61 +577,86 @@ def _record_span_start(span: Span, attrs: dict):
         Span object.
     attrs : dict
         Creation-time attributes.
+    name, kind, location : str, optional
+        Field values the caller already holds; any left as None are read
+        back from the span through its PyO3 getters.
     """
-    import json
-
-    # Convert attributes to JSON string
-    attrs_json = None
-    if attrs:
-        attrs_json = json.dumps(attrs)
-    # Sanitize None values to backend-friendly sentinels (tables reject Python None)
-    parent_id = span.parent_id if span.parent_id is not None else -1
-    kind = span.kind if span.kind is not None else ""
-    location = (
-        span.location if hasattr(span, "location") and span.location is not None else ""
+    if not attrs and _native_record_span_start_no_attrs is not None:
+        _native_record_span_start_no_attrs(span)
+        return
+    if _native_record_span_start is not None:
+        _native_record_span_start(span, attrs or None)
+        return
+    ctx = _span_ctx(span, kind, location)
+    trace_id, span_id, parent_id, kind, location, thread_id = ctx
+    _ctxs[span_id] = ctx
+    attributes = _attrs_json(attrs) if attrs else ""
+    _buffer_row(
+        (
+            "span_start",
+            trace_id,
+            span_id,
+            _intern(name if name is not None else span.name),
+            span.start_timestamp,
+            thread_id,
+            parent_id,
+            kind,
+            location,
+            attributes,
+            "",  # event_attributes not applicable
+        )
     )
-    attributes = attrs_json if attrs_json is not None else ""
-    event = TraceEvent(
-        record_type="span_start",
-        trace_id=span.trace_id,
-        span_id=span.span_id,
-        name=span.name,
-        time=span.start_timestamp,
-        thread_id=getattr(span, "thread_id", 0),
-        parent_id=parent_id,
-        kind=kind,
-        location=location,
-        attributes=attributes,
-        event_attributes="",  # not applicable
-    )
-    event.save()
 
 
-def _record_span_end(span: Span):
+def _record_span_end(span: Span, *, _ctxs=_SPAN_CTX, _time_ns=time_ns):
     """Persist span end with minimal data (only end time + span id).
 
     Other fields are blanked to reduce duplication.
     """
-    import time
-
-    end_ts = span.end_timestamp or int(time.time_ns())
-    event = TraceEvent(
-        record_type="span_end",
-        trace_id=0,
-        span_id=span.span_id,
-        name="",
-        time=end_ts,
-        thread_id=getattr(span, "thread_id", 0),
-        parent_id=-1,
-        kind="",
-        location="",
-        attributes="",
-        event_attributes="",
+    if _native_record_span_end_minimal is not None:
+        ctx = _ctxs.pop(span.span_id, None) or _span_ctx(span)
+        _native_record_span_end_minimal(
+            ctx[1], span.end_timestamp or _time_ns(), ctx[5]
+        )
+        return
+    if _native_record_span_end is not None:
+        _native_record_span_end(span)
+        return
+    ctx = _ctxs.pop(span.span_id, None)
+    if ctx is None:
+        # Span started before this module saw it (or without a recorded
+        # start); fall back to reading the fields directly
+        ctx = _span_ctx(span)
+    end_ts = span.end_timestamp or _time_ns()
+    _buffer_row(
+        (
+            "span_end",
+            0,
+            ctx[1],
+            "",
+            end_ts,
+            ctx[5],
+            -1,
+            "",
+            "",
+            "",
+            "",
+        )
     )
-    event.save()
-
-
-def _record_event(span: Span, event_name: str, event_attributes: Optional[list] = None):
+    # Root span ended: drain so queries see the complete trace promptly
+    if ctx[2] == -1:
+        flush_events()
+
+
+def _record_event(
+    span: Span,
+    event_name: str,
+    event_attributes: Optional[list] = None,
+    *,
+    _ctxs=_SPAN_CTX,
+    _intern=sys.intern,
+    _time_ns=time_ns,
+):
     """Persist an event row.
 
     Parameters
@@ -390,11 +668,11 @@ def _record_event(span: Span, event_name: str, event_attributes: Optional[list]
     event_attributes : list, optional
         List of dicts or (key, value) tuples.
     """
-    import json
-    import time
-
-    # Get current timestamp (nanoseconds since epoch)
-    timestamp = int(time.time_ns())
+    if _native_record_event is not None:
+        _native_record_event(span, event_name, event_attributes)
+        return
+    # Current timestamp (nanoseconds since epoch)
+    timestamp = _time_ns()
 
     # Convert event attributes to JSON string
     event_attrs_json = None
@@ -407,29 +685,28 @@ def _record_event(span: Span, event_name: str, event_attributes: Optional[list]
             elif isinstance(attr_item, (list, tuple)) and len(attr_item) == 2:
                 attrs_dict[attr_item[0]] = attr_item[1]
         if attrs_dict:
-            event_attrs_json = json.dumps(attrs_dict)
-
-    parent_id = span.parent_id if span.parent_id is not None else -1
-    kind = span.kind if span.kind is not None else ""
-    location = (
-        span.location if hasattr(span, "location") and span.location is not None else ""
-    )
-    attrs = ""  # span-level attributes not duplicated here
-    event_attrs = event_attrs_json if event_attrs_json is not None else ""
-    event = TraceEvent(
-        record_type="event",
-        trace_id=span.trace_id,
-        span_id=span.span_id,
-        name=event_name,
-        time=timestamp,
-        thread_id=getattr(span, "thread_id", 0),
-        parent_id=parent_id,
-        kind=kind,
-        location=location,
-        attributes=attrs,
-        event_attributes=event_attrs,
+            event_attrs_json = _attrs_json(attrs_dict)
+
+    ctx = _ctxs.get(span.span_id)
+    if ctx is None:
+        ctx = _span_ctx(span)
+    trace_id, span_id, parent_id, kind, location, thread_id = ctx
+    event_attrs = event_attrs_json or ""
+    _buffer_row(
+        (
+            "event",
+            trace_id,
+            span_id,
+            _intern(event_name),
+            timestamp,
+            thread_id,
+            parent_id,
+            kind,
+            location,
+            "",  # span-level attributes not duplicated here
+            event_attrs,
+        )
     )
-    event.save()
 
 
 # Add convenience methods to Span class
@@ -449,7 +726,7 @@ def _span_with(name: str, kind: Optional[str] = None):
         Newly created span (root or child).
     """
     parent = current_span()
-    location = _get_location()
+    location = _get_location() if _LOCATION_ENABLED else None
     if parent:
         return Span.new_child(parent, name, kind=kind, location=location)
     else:
@@ -476,7 +753,7 @@ def _span_decorator(name: Optional[str] = None, kind: Optional[str] = None):
         @functools.wraps(func)
         def wrapper(*wargs, **wkwargs):
             span_name = name or func.__name__
-            location = _get_location()
+            location = _get_location() if _LOCATION_ENABLED else None
             with span_raw(span_name, kind=kind, location=location) as s:
                 return func(*wargs, **wkwargs)
 
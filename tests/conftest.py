@@ -0,0 +1,13 @@
+"""Top-level test configuration.
+
+Inserts the python/ source directory on sys.path exactly once, so
+individual test modules do not each prepend their own copy (duplicate
+entries lengthen every subsequent import's search).
+"""
+
+import pathlib
+import sys
+
+PYTHON_DIR = str((pathlib.Path(__file__).parent.parent / "python").resolve())
+if PYTHON_DIR not in sys.path:
+    sys.path.insert(0, PYTHON_DIR)
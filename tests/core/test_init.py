@@ -5,6 +5,12 @@ import subprocess
 import sys
 import tempfile
 
+import pytest
+
+# Every test here launches at least one fresh interpreter via subprocess;
+# skip them in the fast loop with `pytest -m "not slow"`
+pytestmark = pytest.mark.slow
+
 
 def test_should_enable_probing_function_direct():
     """Test should_enable_probing function directly."""
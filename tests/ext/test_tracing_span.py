@@ -1,9 +1,13 @@
+import re
 import time
 
 import pytest
 
 import probing
 
+# One scan instead of one `in` check per alternative
+_STATUS = re.compile(r"Active|Completed")
+
 
 def test_context_manager_basic():
     with probing.span("root") as s:
@@ -95,7 +99,7 @@ def test_repr_contains_core_fields():
         r = repr(s)
         assert "Span" in r
         assert "repr_test" in r
-        assert ("Active" in r) or ("Completed" in r)
+        assert _STATUS.search(r)
 
 
 def test_nested_decorator_and_context_manager():
@@ -1,10 +1,6 @@
 """Tests for Python extension handlers and router."""
 
 import json
-import sys
-
-# Add python directory to path
-sys.path.insert(0, "python")
 
 from probing.handlers.pythonext import handle_api_request
 from probing.handlers.router import (
@@ -3,8 +3,6 @@
 import sys
 from types import ModuleType
 
-import pytest
-
 
 class TestCreateFilter:
     """Test _TraceableCollector.create_filter method."""
@@ -298,4 +296,6 @@ class TestFilterByPrefix:
 
 
 if __name__ == "__main__":
+    import pytest
+
     pytest.main([__file__, "-v"])
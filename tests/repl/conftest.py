@@ -0,0 +1,26 @@
+"""Shared fixtures for the repl test suite.
+
+The python/ source directory is put on sys.path by tests/conftest.py.
+"""
+
+import atexit
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def executor():
+    """One real IPython kernel shared by all tests in a module.
+
+    Kernel startup/teardown dominates these tests' wall time, and the
+    help-magic tests only read magic metadata, so reusing the kernel is
+    safe.
+    """
+    pytest.importorskip("ipykernel")
+    from probing.repl import CodeExecutor
+
+    ex = CodeExecutor()
+    # Defer kernel teardown (zmq channel shutdown) to interpreter exit;
+    # the consumers are read-only, and process exit reaps everything anyway
+    atexit.register(ex.shutdown)
+    return ex
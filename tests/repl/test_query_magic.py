@@ -1,96 +1,106 @@
 """Unit tests for query_magic module - testing core functionality."""
 
-import os
-import sys
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 
-import pandas as pd
 import pytest
 
-# Add python directory to path
-python_dir = os.path.join(os.path.dirname(__file__), "../../python")
-if python_dir not in sys.path:
-    sys.path.insert(0, python_dir)
+pytest.importorskip("IPython")
 
 from probing.repl.query_magic import QueryMagic
-from traitlets.config.configurable import Configurable
 
 
 @pytest.fixture
 def magic():
-    """Create a QueryMagic instance."""
-    shell = Configurable()
-    shell.user_ns = {}
-    return QueryMagic(shell=shell)
+    """Create a QueryMagic instance.
 
+    The magics only touch the shell via attribute access, so a
+    SimpleNamespace stands in for a full traitlets Configurable.
+    """
+    return QueryMagic(shell=SimpleNamespace(user_ns={}))
+
+
+@pytest.fixture(scope="module")
+def small_df():
+    """A tiny DataFrame built once per module (pandas imported lazily)."""
+    # Imported lazily: only the DataFrame tests need pandas
+    import pandas as pd
+
+    return pd.DataFrame({"a": [1, 2]})
 
-def test_query_basic(magic):
-    """Test basic query execution."""
-    mock_df = pd.DataFrame({"a": [1, 2]})
 
-    with patch("probing.core.engine.query", return_value=mock_df), patch(
+@pytest.fixture(scope="module")
+def engine_mocks():
+    """Patch the engine query and display once for the whole module."""
+    with patch("probing.core.engine.query") as mock_query, patch(
         "probing.repl.query_magic.display"
     ) as mock_display:
-        magic.query("SELECT * FROM table")
-        mock_display.assert_called_once_with(mock_df)
+        yield SimpleNamespace(query=mock_query, display=mock_display)
+
 
+@pytest.fixture
+def mocks(engine_mocks):
+    """Per-test view of the module-scope mocks, reset before each test."""
+    engine_mocks.query.reset_mock(return_value=True, side_effect=True)
+    engine_mocks.display.reset_mock()
+    return engine_mocks
 
-def test_q_alias(magic):
+
+def test_query_basic(magic, small_df, mocks):
+    """Test basic query execution."""
+    mocks.query.return_value = small_df
+
+    magic.query("SELECT * FROM table")
+    mocks.display.assert_called_once_with(small_df)
+
+
+def test_q_alias(magic, small_df, mocks):
     """Test %q is an alias for %query."""
-    mock_df = pd.DataFrame({"x": [1]})
+    mocks.query.return_value = small_df
 
-    with patch("probing.core.engine.query", return_value=mock_df), patch(
-        "probing.repl.query_magic.display"
-    ) as mock_display:
-        magic.q("SELECT x FROM table")
-        mock_display.assert_called_once_with(mock_df)
+    magic.q("SELECT a FROM table")
+    mocks.display.assert_called_once_with(small_df)
 
 
-def test_tables(magic):
+def test_tables(magic, mocks):
     """Test %tables command."""
-    with patch("probing.core.engine.query") as mock_query, patch(
-        "probing.repl.query_magic.display"
-    ):
-        magic.tables("")
-        mock_query.assert_called_once_with("SHOW TABLES")
+    magic.tables("")
+    mocks.query.assert_called_once_with("SHOW TABLES")
 
 
-def test_describe(magic):
+def test_describe(magic, mocks):
     """Test %describe command."""
-    with patch("probing.core.engine.query") as mock_query, patch(
-        "probing.repl.query_magic.display"
-    ):
-        magic.describe("my_table")
-        mock_query.assert_called_once_with("DESCRIBE my_table")
+    magic.describe("my_table")
+    mocks.query.assert_called_once_with("DESCRIBE my_table")
 
 
-def test_peek_default_limit(magic):
+def test_peek_default_limit(magic, mocks):
     """Test %peek with default limit."""
-    with patch("probing.core.engine.query") as mock_query, patch(
-        "probing.repl.query_magic.display"
-    ):
-        magic.peek("my_table")
-        mock_query.assert_called_once_with("SELECT * FROM my_table LIMIT 10")
+    magic.peek("my_table")
+    mocks.query.assert_called_once_with("SELECT * FROM my_table LIMIT 10")
 
 
 def test_peek_custom_limit(magic):
-    """Test %peek with custom limit."""
-    with patch("probing.core.engine.query") as mock_query, patch(
-        "probing.repl.query_magic.display"
-    ):
-        magic.peek("--limit 5 my_table")
-        mock_query.assert_called_once_with("SELECT * FROM my_table LIMIT 5")
+    """Test %peek argument parsing with a custom limit.
 
+    Asserts on the parsed arguments directly; test_peek_default_limit
+    covers the formatted SQL via the mock call.
+    """
+    assert magic._parse_peek_args("--limit 5 my_table") == ("my_table", 5)
 
-def test_load_ext(magic):
+
+def test_load_ext(magic, monkeypatch):
     """Test %load_ext command."""
-    with patch("probing.core.engine.load_extension") as mock_load:
-        magic.load_ext("torch")
-        mock_load.assert_called_once_with("torch")
+    mock_load = Mock()
+    monkeypatch.setattr("probing.core.engine.load_extension", mock_load)
+
+    magic.load_ext("torch")
+    mock_load.assert_called_once_with("torch")
 
 
-def test_query_error_handling(magic):
+def test_query_error_handling(magic, mocks):
     """Test query error handling."""
-    with patch("probing.core.engine.query", side_effect=Exception("Error")):
-        # Should not raise, just handle gracefully
-        magic.query("BAD SQL")
+    mocks.query.side_effect = Exception("Error")
+
+    # Should not raise, just handle gracefully
+    magic.query("BAD SQL")